@@ -7,7 +7,7 @@ from typing import Optional
 from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class Categoria:
     """
     Entidad de dominio para categorías de productos.
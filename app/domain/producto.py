@@ -8,7 +8,7 @@ from datetime import datetime
 from decimal import Decimal
 
 
-@dataclass
+@dataclass(slots=True)
 class Producto:
     """
     Entidad de dominio para productos del inventario.
@@ -19,6 +19,9 @@ from app.infrastructure.models.proveedor import (  # ✅ NUEVO: sistema de prove
 
 logger = logging.getLogger(__name__)
 
+# Segundos que SQLite espera por un bloqueo antes de lanzar "database is locked"
+SQLITE_BUSY_TIMEOUT = 30
+
 
 class Database:
     """Clase para manejar la conexión y sesiones de base de datos"""
@@ -36,8 +39,21 @@ class Database:
         poolclass = None
 
         if "sqlite" in DatabaseConfig.URL:
-            connect_args = {"check_same_thread": False}
-            poolclass = StaticPool
+            # Las conexiones del pool pasan entre hilos (GUI, QThreadPool,
+            # importador), por eso se desactiva check_same_thread. El timeout
+            # hace que un lector espere al escritor en vez de fallar con
+            # "database is locked".
+            connect_args = {
+                "check_same_thread": False,
+                "timeout": SQLITE_BUSY_TIMEOUT,
+            }
+            # Solo la BD en memoria necesita una única conexión compartida
+            # (cada conexión nueva vería una BD vacía). Con archivo se usa
+            # el QueuePool por defecto: cada sesión toma su propia conexión,
+            # así el rollback al cerrar una sesión del hilo GUI no descarta
+            # lo que otro hilo tiene pendiente en su transacción.
+            if ":memory:" in DatabaseConfig.URL or DatabaseConfig.URL.rstrip("/") == "sqlite:":
+                poolclass = StaticPool
             logger.info(f"Configurando SQLite: {DatabaseConfig.URL}")
 
         # Crear el motor
@@ -49,12 +65,16 @@ class Database:
             pool_pre_ping=True,  # Verifica conexiones antes de usarlas
         )
 
-        # Habilitar foreign keys en SQLite
+        # Habilitar foreign keys en SQLite. WAL (persistente en el archivo)
+        # permite que las conexiones de otros hilos sigan leyendo mientras
+        # el importador escribe, y cada commit se anexa al log en vez de
+        # reescribir páginas; synchronous queda en su valor por defecto
         if "sqlite" in DatabaseConfig.URL:
             @event.listens_for(self.engine, "connect")
             def set_sqlite_pragma(dbapi_conn, connection_record):
                 cursor = dbapi_conn.cursor()
                 cursor.execute("PRAGMA foreign_keys=ON")
+                cursor.execute("PRAGMA journal_mode=WAL")
                 cursor.close()
 
         # Crear SessionLocal
@@ -3,8 +3,9 @@ Repositorio para operaciones CRUD de productos.
 Implementa el patrón Repository para abstraer el acceso a datos.
 """
 from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
+from sqlalchemy.orm import Session, contains_eager
+from sqlalchemy import or_, and_, insert
+from dataclasses import replace
 from decimal import Decimal
 import logging
 
@@ -56,6 +57,16 @@ class ProductRepository:
             updated_at=model.updated_at,
         )
 
+    def _query_con_categoria(self, session: Session):
+        """
+        Query de productos con la categoría resuelta en el mismo SELECT
+        (LEFT JOIN), para no lanzar una consulta por producto al leer
+        categoria_nombre en _model_to_entity.
+        """
+        return session.query(ProductoModel).outerjoin(
+            ProductoModel.categoria
+        ).options(contains_eager(ProductoModel.categoria))
+
     def _entity_to_model(self, entity: Producto, model: Optional[ProductoModel] = None) -> ProductoModel:
         """Convierte una entidad de dominio a modelo ORM"""
         if model is None:
@@ -75,6 +86,22 @@ class ProductRepository:
 
         return model
 
+    def _entity_to_mapping(self, entity: Producto) -> dict:
+        """Convierte una entidad de dominio a un diccionario de columnas (operaciones masivas)"""
+        return {
+            "codigo": entity.codigo,
+            "nombre": entity.nombre,
+            "descripcion": entity.descripcion,
+            "precio": float(entity.precio),
+            "stock": entity.stock,
+            "stock_minimo": entity.stock_minimo,
+            "unidad_medida": entity.unidad_medida,
+            "categoria_id": entity.categoria_id,
+            "marca": entity.marca,
+            "ubicacion": entity.ubicacion,
+            "activo": entity.activo,
+        }
+
     def create(self, producto: Producto) -> Producto:
         """
         Crea un nuevo producto en la base de datos.
@@ -139,7 +166,7 @@ class ProductRepository:
 
     def get_all(self, solo_activos: bool = True) -> List[Producto]:
         """
-        Obtiene todos los productos.
+        Obtiene todos los productos con el nombre de su categoría ya resuelto.
 
         Args:
             solo_activos: Si True, solo retorna productos activos
@@ -149,7 +176,7 @@ class ProductRepository:
         """
         session = self._get_session()
         try:
-            query = session.query(ProductoModel)
+            query = self._query_con_categoria(session)
             if solo_activos:
                 query = query.filter(ProductoModel.activo == True)
             models = query.all()
@@ -158,6 +185,50 @@ class ProductRepository:
             if self._owns_session:
                 session.close()
 
+    def count(self, solo_activos: bool = True) -> int:
+        """
+        Cuenta los productos.
+
+        Args:
+            solo_activos: Si True, solo cuenta productos activos
+
+        Returns:
+            Número de productos
+        """
+        session = self._get_session()
+        try:
+            query = session.query(ProductoModel)
+            if solo_activos:
+                query = query.filter(ProductoModel.activo == True)
+            return query.count()
+        finally:
+            if self._owns_session:
+                session.close()
+
+    def get_page(self, offset: int, limit: int, solo_activos: bool = True) -> List[Producto]:
+        """
+        Obtiene una página de productos (orden estable por ID) con el nombre
+        de su categoría ya resuelto.
+
+        Args:
+            offset: Número de productos a saltar
+            limit: Tamaño máximo de la página
+            solo_activos: Si True, solo retorna productos activos
+
+        Returns:
+            Lista de productos de la página
+        """
+        session = self._get_session()
+        try:
+            query = self._query_con_categoria(session)
+            if solo_activos:
+                query = query.filter(ProductoModel.activo == True)
+            models = query.order_by(ProductoModel.id).offset(offset).limit(limit).all()
+            return [self._model_to_entity(m) for m in models]
+        finally:
+            if self._owns_session:
+                session.close()
+
     def search(self, query: str, solo_activos: bool = True) -> List[Producto]:
         """
         Busca productos por nombre, código o descripción.
@@ -172,7 +243,7 @@ class ProductRepository:
         session = self._get_session()
         try:
             search_pattern = f"%{query}%"
-            db_query = session.query(ProductoModel).filter(
+            db_query = self._query_con_categoria(session).filter(
                 or_(
                     ProductoModel.nombre.ilike(search_pattern),
                     ProductoModel.codigo.ilike(search_pattern),
@@ -297,7 +368,7 @@ class ProductRepository:
         """
         session = self._get_session()
         try:
-            query = session.query(ProductoModel).filter(
+            query = self._query_con_categoria(session).filter(
                 ProductoModel.categoria_id == categoria_id
             )
 
@@ -322,7 +393,7 @@ class ProductRepository:
         """
         session = self._get_session()
         try:
-            query = session.query(ProductoModel).filter(
+            query = self._query_con_categoria(session).filter(
                 ProductoModel.stock <= ProductoModel.stock_minimo
             )
 
@@ -345,7 +416,7 @@ class ProductRepository:
         """
         session = self._get_session()
         try:
-            models = session.query(ProductoModel).filter(
+            models = self._query_con_categoria(session).filter(
                 and_(
                     ProductoModel.stock <= ProductoModel.stock_minimo,
                     ProductoModel.activo == True
@@ -386,6 +457,77 @@ class ProductRepository:
             if self._owns_session:
                 session.close()
 
+    def bulk_upsert(self, nuevos: List[Producto], existentes: List[Producto]) -> List[Producto]:
+        """
+        Inserta y actualiza un lote de productos en una sola transacción
+        (INSERT ... RETURNING / UPDATE con executemany). Los IDs de los
+        creados se obtienen dentro de la transacción; si algo falla no se
+        confirma nada del lote.
+
+        Args:
+            nuevos: Productos a crear (sin ID)
+            existentes: Productos a actualizar (con ID)
+
+        Returns:
+            Productos creados, con su ID asignado (mismo orden que nuevos)
+        """
+        session = self._get_session()
+        try:
+            creados = []
+            if nuevos:
+                ids = session.scalars(
+                    insert(ProductoModel).returning(
+                        ProductoModel.id, sort_by_parameter_order=True
+                    ),
+                    [self._entity_to_mapping(p) for p in nuevos],
+                ).all()
+                creados = [replace(p, id=pid) for p, pid in zip(nuevos, ids)]
+            if existentes:
+                session.bulk_update_mappings(
+                    ProductoModel,
+                    [dict(self._entity_to_mapping(p), id=p.id) for p in existentes]
+                )
+            session.commit()
+            logger.info(f"Lote guardado: {len(nuevos)} creados, {len(existentes)} actualizados")
+            return creados
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error al guardar lote de productos: {e}")
+            raise
+        finally:
+            if self._owns_session:
+                session.close()
+
+    def set_stock_minimo_bulk(self, valor: int, solo_activos: bool = True) -> int:
+        """
+        Fija el mismo stock mínimo a todos los productos con un único UPDATE.
+
+        Args:
+            valor: Nuevo stock mínimo
+            solo_activos: Si True, solo afecta a productos activos
+
+        Returns:
+            Número de productos actualizados
+        """
+        session = self._get_session()
+        try:
+            query = session.query(ProductoModel)
+            if solo_activos:
+                query = query.filter(ProductoModel.activo == True)
+            filas = query.update(
+                {ProductoModel.stock_minimo: valor}, synchronize_session=False
+            )
+            session.commit()
+            logger.info(f"Stock mínimo fijado a {valor} en {filas} productos")
+            return filas
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error al actualizar stock mínimo masivo: {e}")
+            raise
+        finally:
+            if self._owns_session:
+                session.close()
+
     def delete(self, producto_id: int, soft_delete: bool = True) -> bool:
         """
         Elimina un producto.
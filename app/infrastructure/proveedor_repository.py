@@ -5,6 +5,7 @@ Maneja también la relación producto-proveedor.
 from typing import List, Optional
 from sqlalchemy.orm import Session
 import logging
+import time
 
 from app.infrastructure.models.proveedor import (
     ProveedorModel, ProductoProveedorModel
@@ -12,6 +13,16 @@ from app.infrastructure.models.proveedor import (
 
 logger = logging.getLogger(__name__)
 
+# Caché de proveedores activos compartido entre instancias del repositorio
+# (p. ej. varias altas de productos seguidas consultan una sola vez)
+PROVEEDORES_CACHE_TTL = 30.0  # segundos
+_proveedores_cache = {"ts": 0.0, "data": None}
+
+
+def invalidate_proveedor_cache() -> None:
+    """Descarta la lista de proveedores en caché (tras crear/editar/desactivar)"""
+    _proveedores_cache["data"] = None
+
 
 # ---------------------------------------------------------------------------
 # Entidad de dominio ligera (sin ORM, sin dependencias circulares)
@@ -83,6 +94,7 @@ class ProveedorRepository:
             session.add(model)
             session.commit()
             session.refresh(model)
+            invalidate_proveedor_cache()
             logger.info(f"Proveedor creado: {model.nombre} (ID: {model.id})")
             return self._to_entity(model)
         except Exception as e:
@@ -104,6 +116,18 @@ class ProveedorRepository:
         finally:
             session.close()
 
+    def get_all_cached(self) -> List[Proveedor]:
+        """
+        Proveedores activos desde la caché compartida; se vuelven a consultar
+        pasado PROVEEDORES_CACHE_TTL o tras cualquier cambio de proveedores.
+        """
+        ahora = time.monotonic()
+        if (_proveedores_cache["data"] is None
+                or ahora - _proveedores_cache["ts"] > PROVEEDORES_CACHE_TTL):
+            _proveedores_cache["data"] = self.get_all()
+            _proveedores_cache["ts"] = ahora
+        return _proveedores_cache["data"]
+
     def get_by_id(self, proveedor_id: int) -> Optional[Proveedor]:
         """Obtiene un proveedor por ID"""
         session = self._get_session()
@@ -131,6 +155,7 @@ class ProveedorRepository:
             model.notas = proveedor.notas
             session.commit()
             session.refresh(model)
+            invalidate_proveedor_cache()
             logger.info(f"Proveedor actualizado: {model.nombre} (ID: {model.id})")
             return self._to_entity(model)
         except Exception as e:
@@ -151,6 +176,7 @@ class ProveedorRepository:
                 return False
             model.activo = False
             session.commit()
+            invalidate_proveedor_cache()
             logger.info(f"Proveedor desactivado: {model.nombre} (ID: {proveedor_id})")
             return True
         except Exception as e:
@@ -241,4 +267,4 @@ class ProveedorRepository:
             session.close()
 
 
-__all__ = ["Proveedor", "ProveedorRepository"]
+__all__ = ["Proveedor", "ProveedorRepository", "invalidate_proveedor_cache"]
@@ -6,8 +6,7 @@ from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QTableWidget, QTableWidgetItem, QSpinBox, QHeaderView
 )
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QFont
+from PyQt5.QtCore import Qt, pyqtSlot
 from typing import List, Dict
 import logging
 
@@ -15,6 +14,48 @@ from app.domain.producto import Producto
 
 logger = logging.getLogger(__name__)
 
+_TABLE_CSS = """
+    QTableWidget {
+        border: 1px solid #e2e8f0;
+        border-radius: 8px;
+        background-color: white;
+    }
+    QTableWidget::item {
+        padding: 8px;
+    }
+    QHeaderView::section {
+        background-color: #f7fafc;
+        padding: 10px;
+        border: none;
+        border-bottom: 2px solid #e2e8f0;
+        font-weight: 600;
+        color: #2d3748;
+    }
+    QSpinBox {
+        font-size: 11pt;
+        padding: 2px 4px;
+        padding-right: 18px;
+    }
+"""
+
+_ALIGN_CENTER = int(Qt.AlignCenter)
+_READONLY_FLAGS = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+# Prototipos de celda: se clonan por fila en lugar de configurar cada item
+_PROTO_STOCK = QTableWidgetItem()
+_PROTO_STOCK.setTextAlignment(_ALIGN_CENTER)
+_PROTO_STOCK.setFlags(_READONLY_FLAGS)
+
+_PROTO_CENTER = QTableWidgetItem()
+_PROTO_CENTER.setTextAlignment(_ALIGN_CENTER)
+
+
+def _cell(proto: QTableWidgetItem, text: str) -> QTableWidgetItem:
+    """Clona un prototipo de celda y le asigna el texto"""
+    item = proto.clone()
+    item.setText(text)
+    return item
+
 
 class ReviewDialog(QDialog):
     """Diálogo para revisar pedido antes de generar PDF"""
@@ -22,6 +63,11 @@ class ReviewDialog(QDialog):
     def __init__(self, productos: List[Producto], parent=None):
         super().__init__(parent)
         self.productos = productos
+        # Cantidad sugerida y precio por producto, calculados una sola vez
+        self._sugerido = {
+            p.id: max(p.stock_minimo - p.stock, p.stock_minimo) for p in productos
+        }
+        self._precios = {p.id: float(p.precio) for p in productos}
         self.cantidades_editadas = {}
         self.total_estimado = 0
 
@@ -55,8 +101,7 @@ class ReviewDialog(QDialog):
             "Faltante", "Cantidad a Pedir", "Precio Unit.", "Subtotal"
         ])
 
-        # Configurar tabla
-        self.tabla.setAlternatingRowColors(True)
+        # Configurar tabla (colores alternos y estilos se aplican tras llenarla)
         self.tabla.setSelectionBehavior(QTableWidget.SelectRows)
         self.tabla.setEditTriggers(QTableWidget.NoEditTriggers)
         self.tabla.verticalHeader().setVisible(False)
@@ -67,30 +112,13 @@ class ReviewDialog(QDialog):
         for i in [1, 2, 3, 4, 5]:
             header.setSectionResizeMode(i, QHeaderView.ResizeToContents)
 
-        self.tabla.setStyleSheet("""
-            QTableWidget {
-                border: 1px solid #e2e8f0;
-                border-radius: 8px;
-                background-color: white;
-            }
-            QTableWidget::item {
-                padding: 8px;
-            }
-            QHeaderView::section {
-                background-color: #f7fafc;
-                padding: 10px;
-                border: none;
-                border-bottom: 2px solid #e2e8f0;
-                font-weight: 600;
-                color: #2d3748;
-            }
-        """)
-
         # Configurar altura de filas para que el SpinBox quepa cómodamente
         self.tabla.verticalHeader().setDefaultSectionSize(45)
 
         # Llenar tabla
         self.llenar_tabla()
+        self.tabla.setAlternatingRowColors(True)
+        self.tabla.setStyleSheet(_TABLE_CSS)
 
         layout.addWidget(self.tabla)
 
@@ -127,28 +155,25 @@ class ReviewDialog(QDialog):
         """Llena la tabla con los productos"""
         self.tabla.setRowCount(0)
         self.spinboxes = {}
+        self._subtotal_items = {}  # producto.id -> celda de subtotal
 
         for producto in self.productos:
             row = self.tabla.rowCount()
             self.tabla.insertRow(row)
 
             faltante = producto.stock_minimo - producto.stock
-            cantidad_sugerida = max(faltante, producto.stock_minimo)
+            cantidad_sugerida = self._sugerido[producto.id]
 
-            # Producto
-            self.tabla.setItem(row, 0, QTableWidgetItem(producto.nombre))
+            # Producto (el id se guarda en UserRole para localizar la fila)
+            nombre_item = QTableWidgetItem(producto.nombre)
+            nombre_item.setData(Qt.UserRole, producto.id)
+            self.tabla.setItem(row, 0, nombre_item)
 
             # Stock Actual
-            item_stock = QTableWidgetItem(str(producto.stock))
-            item_stock.setTextAlignment(Qt.AlignCenter)
-            item_stock.setFlags(Qt.ItemIsEnabled | Qt.ItemIsSelectable)
-            self.tabla.setItem(row, 1, item_stock)
+            self.tabla.setItem(row, 1, _cell(_PROTO_STOCK, str(producto.stock)))
 
             # Faltante (Columna 2)
-            item_faltante = QTableWidgetItem(str(faltante))
-            item_faltante.setTextAlignment(Qt.AlignCenter)
-            item_faltante.setFlags(Qt.ItemIsEnabled | Qt.ItemIsSelectable)
-            self.tabla.setItem(row, 2, item_faltante)
+            self.tabla.setItem(row, 2, _cell(_PROTO_STOCK, str(faltante)))
 
             # Cantidad a Pedir (SpinBox editable) (Columna 3)
             spinbox = QSpinBox()
@@ -159,63 +184,46 @@ class ReviewDialog(QDialog):
             # Tamaño ajustado para caber en la columna
             spinbox.setFixedWidth(65)
             spinbox.setFixedHeight(28)
-            spinbox.setStyleSheet("""
-                QSpinBox {
-                    font-size: 11pt;
-                    padding: 2px 4px;
-                    padding-right: 18px;
-                }
-            """)
-            spinbox.valueChanged.connect(lambda v, p=producto: self.on_cantidad_changed(p, v))
+            spinbox.setProperty("producto_id", producto.id)
+            spinbox.valueChanged.connect(self._on_spin_changed)
             self.tabla.setCellWidget(row, 3, spinbox)
             self.spinboxes[producto.id] = spinbox
 
             # Precio Unitario (Columna 4)
-            item_precio = QTableWidgetItem(f"${producto.precio:.2f}")
-            item_precio.setTextAlignment(Qt.AlignCenter)
-            self.tabla.setItem(row, 4, item_precio)
+            self.tabla.setItem(row, 4, _cell(_PROTO_CENTER, f"${producto.precio:.2f}"))
 
             # Subtotal (Columna 5)
-            subtotal = float(producto.precio) * cantidad_sugerida
-            item_subtotal = QTableWidgetItem(f"${subtotal:.2f}")
-            item_subtotal.setTextAlignment(Qt.AlignCenter)
-            self.tabla.setItem(row, 5, item_subtotal)
-
-    def on_cantidad_changed(self, producto: Producto, nueva_cantidad: int):
-        """Maneja cambio de cantidad"""
-        self.cantidades_editadas[producto.id] = nueva_cantidad
+            subtotal = self._precios[producto.id] * cantidad_sugerida
+            subtotal_item = _cell(_PROTO_CENTER, f"${subtotal:.2f}")
+            self.tabla.setItem(row, 5, subtotal_item)
+            self._subtotal_items[producto.id] = subtotal_item
+
+    @pyqtSlot(int)
+    def _on_spin_changed(self, nueva_cantidad: int):
+        """Slot único para todos los SpinBox; identifica el producto por su propiedad"""
+        spinbox = self.sender()
+        if spinbox is None:
+            return
+        producto_id = spinbox.property("producto_id")
+        self.cantidades_editadas[producto_id] = nueva_cantidad
         self.calcular_total()
 
         # Actualizar subtotal en la tabla
-        for row in range(self.tabla.rowCount()):
-            item_nombre = self.tabla.item(row, 0)
-            if item_nombre and item_nombre.text() == producto.nombre:
-                subtotal = float(producto.precio) * nueva_cantidad
-                self.tabla.item(row, 6).setText(f"${subtotal:.2f}")
-                break
+        subtotal = self._precios[producto_id] * nueva_cantidad
+        self._subtotal_items[producto_id].setText(f"${subtotal:.2f}")
 
     def calcular_total(self):
         """Calcula el total estimado"""
-        total = 0
-        for producto in self.productos:
-            if producto.id in self.cantidades_editadas:
-                cantidad = self.cantidades_editadas[producto.id]
-            else:
-                faltante = producto.stock_minimo - producto.stock
-                cantidad = max(faltante, producto.stock_minimo)
-
-            total += float(producto.precio) * cantidad
+        editadas = self.cantidades_editadas
+        sugerido = self._sugerido
+        total = sum(
+            precio * editadas.get(pid, sugerido[pid])
+            for pid, precio in self._precios.items()
+        )
 
         self.total_estimado = total
         self.total_label.setText(f"TOTAL ESTIMADO: ${total:.2f}")
 
     def get_cantidades_editadas(self) -> Dict[int, int]:
-        """Retorna las cantidades editadas"""
-        # Asegurar que todas las cantidades estén en el diccionario
-        for producto in self.productos:
-            if producto.id not in self.cantidades_editadas:
-                spinbox = self.spinboxes.get(producto.id)
-                if spinbox:
-                    self.cantidades_editadas[producto.id] = spinbox.value()
-
-        return self.cantidades_editadas
+        """Retorna las cantidades a pedir leídas de los SpinBox"""
+        return {pid: sb.value() for pid, sb in self.spinboxes.items()}
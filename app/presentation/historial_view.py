@@ -4,18 +4,68 @@ Muestra el historial de conversaciones pasadas con el asistente.
 """
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QListWidget,
-    QTextBrowser, QLabel, QDateEdit, QComboBox, QLineEdit,
-    QMessageBox, QListWidgetItem
+    QTextBrowser, QLabel, QMessageBox, QListWidgetItem
 )
-from PyQt5.QtCore import Qt, QDate
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
 from PyQt5.QtGui import QFont
-from datetime import datetime
+from html import escape
 import logging
 
 from app.services.conversation_service import ConversationService
 
 logger = logging.getLogger(__name__)
 
+# Estilos del panel de detalles (constantes: solo varían fecha y total de mensajes)
+_CSS = (
+    "body { font-family: 'Segoe UI', Arial, sans-serif; padding: 15px; }"
+    "h2 { color: #2c3e50; border-bottom: 2px solid #cc785c; padding-bottom: 10px; }"
+    ".meta { color: #6c757d; font-size: 11pt; margin-bottom: 20px; }"
+    ".interaction { margin-bottom: 30px; padding: 18px; background: #f8f9fa; border-radius: 8px; border-left: 3px solid #cc785c; }"
+    ".question { color: #495057; font-weight: 600; margin-bottom: 8px; }"
+    ".answer { color: #cc785c; margin-bottom: 8px; }"
+    ".stats { font-size: 9pt; color: #6c757d; }"
+    "hr { border: none; border-top: 1px solid #dee2e6; margin: 15px 0; }"
+)
+
+_HEADER_TMPL = (
+    # Las llaves del CSS se duplican para que str.format las deje intactas
+    '<html><head><style>' + _CSS.replace('{', '{{').replace('}', '}}') + '</style></head><body>'
+    '<h2>Conversación del {fecha}</h2>'
+    '<div class="meta"><strong>Total de mensajes:</strong> {n}</div><hr>'
+)
+
+_FOOTER = "</body></html>"
+
+
+# ============================================================================
+# WORKER PARA CONSULTAS AL HISTORIAL
+# ============================================================================
+class _ConvFetcherSignals(QObject):
+    """Señales del worker (QRunnable no hereda de QObject)"""
+    finished = pyqtSignal(object, object)  # (tag, resultado)
+    error = pyqtSignal(object, str)  # (tag, mensaje)
+
+
+class _ConvFetcher(QRunnable):
+    """Ejecuta una consulta del repositorio en el QThreadPool global"""
+
+    def __init__(self, tag, fn, *args, **kwargs):
+        super().__init__()
+        self.tag = tag
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = _ConvFetcherSignals()
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            resultado = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.error.emit(self.tag, str(e))
+            return
+        self.signals.finished.emit(self.tag, resultado)
+
 
 class HistorialView(QWidget):
     """Vista para mostrar el historial de conversaciones"""
@@ -23,6 +73,9 @@ class HistorialView(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.conversation_service = ConversationService()
+        # Contadores para descartar respuestas de consultas ya superadas
+        self._list_request = 0
+        self._detail_request = 0
         self.setup_ui()
         self.load_conversations()
 
@@ -71,6 +124,10 @@ class HistorialView(QWidget):
 
     def create_filter_panel(self):
         """Crea el panel de filtros"""
+        # Importación local: el panel de filtros aún no se usa en setup_ui
+        from PyQt5.QtWidgets import QDateEdit, QComboBox, QLineEdit
+        from PyQt5.QtCore import QDate
+
         panel = QWidget()
         layout = QHBoxLayout(panel)
         layout.setContentsMargins(0, 0, 0, 0)
@@ -105,10 +162,23 @@ class HistorialView(QWidget):
         return panel
 
     def load_conversations(self):
-        """Carga conversaciones desde la base de datos"""
-        try:
-            conversations = self.conversation_service.repository.get_recent_conversations(limit=50)
+        """Carga conversaciones desde la base de datos en segundo plano"""
+        self._list_request += 1
+        fetcher = _ConvFetcher(
+            self._list_request,
+            self.conversation_service.repository.get_recent_conversations,
+            limit=50
+        )
+        fetcher.signals.finished.connect(self._populate_list)
+        fetcher.signals.error.connect(self._on_list_error)
+        QThreadPool.globalInstance().start(fetcher)
+
+    def _populate_list(self, tag, conversations):
+        """Llena la lista con las conversaciones obtenidas por el worker"""
+        if tag != self._list_request:
+            return
 
+        try:
             self.conversation_list.clear()
 
             if not conversations:
@@ -118,20 +188,38 @@ class HistorialView(QWidget):
                 self.details_panel.setHtml("<p>No hay conversaciones para mostrar.</p>")
                 return
 
+            # Construir todos los items antes de tocar la lista
+            items = []
             for conv in conversations:
                 # Formatear item
                 fecha = conv.started_at.strftime('%d/%m/%Y %H:%M')
                 item_text = f"{fecha} - {conv.total_interactions} mensajes"
                 item = QListWidgetItem(item_text)
                 item.setData(Qt.UserRole, conv.id)
-                self.conversation_list.addItem(item)
+                items.append(item)
+
+            # Insertar en bloque sin repintar ni emitir señales por cada item
+            self.conversation_list.setUpdatesEnabled(False)
+            self.conversation_list.blockSignals(True)
+            try:
+                for item in items:
+                    self.conversation_list.addItem(item)
+            finally:
+                self.conversation_list.blockSignals(False)
+                self.conversation_list.setUpdatesEnabled(True)
 
             logger.info(f"Cargadas {len(conversations)} conversaciones")
-
         except Exception as e:
             logger.error(f"Error al cargar conversaciones: {e}")
             QMessageBox.warning(self, "Error", f"No se pudo cargar el historial: {e}")
 
+    def _on_list_error(self, tag, mensaje):
+        """Informa un error al cargar la lista de conversaciones"""
+        if tag != self._list_request:
+            return
+        logger.error(f"Error al cargar conversaciones: {mensaje}")
+        QMessageBox.warning(self, "Error", f"No se pudo cargar el historial: {mensaje}")
+
     def on_conversation_selected(self, item):
         """Muestra detalles de la conversación seleccionada"""
         conversation_id = item.data(Qt.UserRole)
@@ -139,54 +227,57 @@ class HistorialView(QWidget):
         if not conversation_id:
             return
 
+        self._detail_request += 1
+        fetcher = _ConvFetcher(
+            self._detail_request,
+            self.conversation_service.repository.get_conversation_with_interactions,
+            conversation_id
+        )
+        fetcher.signals.finished.connect(self._show_conversation)
+        fetcher.signals.error.connect(self._on_detail_error)
+        QThreadPool.globalInstance().start(fetcher)
+
+    def _show_conversation(self, tag, resultado):
+        """Renderiza la conversación obtenida por el worker"""
+        if tag != self._detail_request:
+            return
+
         try:
-            conv, interactions = self.conversation_service.repository.get_conversation_with_interactions(conversation_id)
+            conv, interactions = resultado
 
             # Formatear HTML
-            html = f"""
-            <html>
-            <head>
-                <style>
-                    body {{ font-family: 'Segoe UI', Arial, sans-serif; padding: 15px; }}
-                    h2 {{ color: #2c3e50; border-bottom: 2px solid #cc785c; padding-bottom: 10px; }}
-                    .meta {{ color: #6c757d; font-size: 11pt; margin-bottom: 20px; }}
-                    .interaction {{ margin-bottom: 30px; padding: 18px; background: #f8f9fa; border-radius: 8px; border-left: 3px solid #cc785c; }}
-                    .question {{ color: #495057; font-weight: 600; margin-bottom: 8px; }}
-                    .answer {{ color: #cc785c; margin-bottom: 8px; }}
-                    .stats {{ font-size: 9pt; color: #6c757d; }}
-                    hr {{ border: none; border-top: 1px solid #dee2e6; margin: 15px 0; }}
-                </style>
-            </head>
-            <body>
-                <h2>Conversación del {conv.started_at.strftime('%d/%m/%Y %H:%M')}</h2>
-                <div class="meta">
-                    <strong>Total de mensajes:</strong> {conv.total_interactions}
-                </div>
-                <hr>
-            """
+            html = _HEADER_TMPL.format(
+                fecha=conv.started_at.strftime('%d/%m/%Y %H:%M'),
+                n=conv.total_interactions
+            )
 
             for i, inter in enumerate(interactions, 1):
+                # Escapar contenido del usuario/IA para que '<' o '&' no rompan el HTML
+                a_trunc = inter.answer[:200] + ("..." if len(inter.answer) > 200 else "")
                 html += f"""
                 <div class="interaction">
-                    <div class="question">Usuario: {inter.question}</div>
-                    <div class="answer">Gabo: {inter.answer[:200]}{"..." if len(inter.answer) > 200 else ""}</div>
+                    <div class="question">Usuario: {escape(inter.question)}</div>
+                    <div class="answer">Gabo: {escape(a_trunc)}</div>
                     <div class="stats">
                         Hora: {inter.created_at.strftime('%H:%M:%S')}
                     </div>
                 </div>
                 """
 
-            html += """
-            </body>
-            </html>
-            """
+            html += _FOOTER
 
             self.details_panel.setHtml(html)
-
         except Exception as e:
             logger.error(f"Error al cargar detalles: {e}")
             QMessageBox.warning(self, "Error", f"No se pudo cargar los detalles: {e}")
 
+    def _on_detail_error(self, tag, mensaje):
+        """Informa un error al cargar los detalles de una conversación"""
+        if tag != self._detail_request:
+            return
+        logger.error(f"Error al cargar detalles: {mensaje}")
+        QMessageBox.warning(self, "Error", f"No se pudo cargar los detalles: {mensaje}")
+
     def refresh_all(self):
         """Actualiza conversaciones"""
         self.load_conversations()
@@ -3,16 +3,25 @@ Vista de gestión de inventario.
 Permite ver, agregar, editar y eliminar productos.
 """
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget,
-    QTableWidgetItem, QLineEdit, QLabel, QComboBox, QMessageBox,
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableView,
+    QAbstractItemView, QLineEdit, QLabel, QComboBox, QMessageBox,
     QDialog, QFormLayout, QDoubleSpinBox, QSpinBox, QTextEdit, QGroupBox,
     QFileDialog, QProgressDialog, QMenu, QAction, QHeaderView,
-    QFrame, QScrollArea   # ✅ NUEVO: panel colapsable
+    QFrame,  # ✅ NUEVO: panel colapsable
+    QListView, QStyledItemDelegate, QStyle
 )
-from PyQt5.QtCore import Qt, pyqtSignal
-from PyQt5.QtGui import QColor
+from PyQt5.QtCore import (
+    Qt, pyqtSignal, pyqtSlot, QAbstractTableModel, QAbstractListModel,
+    QModelIndex, QTimer, QObject, QRunnable, QThreadPool, QSignalBlocker,
+    QThread, QRect, QSize
+)
+from PyQt5.QtGui import QColor, QBrush, QPen, QFont, QPainter
+from collections import OrderedDict
+from dataclasses import replace
 from decimal import Decimal
+from operator import attrgetter, itemgetter
 import logging
+import sys
 
 from app.infrastructure.product_repository import ProductRepository, CategoriaRepository
 from app.domain.producto import Producto
@@ -22,6 +31,418 @@ from app.infrastructure.proveedor_repository import ProveedorRepository  # ✅ N
 
 logger = logging.getLogger(__name__)
 
+# Diálogo de autorización; se importa en el primer clic del panel y queda enlazado
+_AlertaAutorizacionDialog = None
+
+# Pinceles y alineaciones reutilizados en cada repintado de la tabla
+_STOCK_BAJO_BG = QBrush(QColor("#f38ba8"))
+_STOCK_BAJO_FG = QBrush(QColor("#1e1e2e"))
+_ALIGN_RIGHT = int(Qt.AlignRight | Qt.AlignVCenter)
+_ALIGN_CENTER = int(Qt.AlignCenter)
+_ALIGN_BY_COL = {4: _ALIGN_RIGHT, 5: _ALIGN_CENTER, 6: _ALIGN_CENTER}
+
+_CENTS = Decimal("0.01")
+
+# Colores de las tarjetas del panel de notificaciones (las pinta el delegado)
+_ALERTA_BG = QBrush(QColor("#fff5f0"))
+_ALERTA_BG_HOVER = QBrush(QColor("#fee2e2"))
+_ALERTA_BORDE = QPen(QColor("#fed7d7"))
+_ALERTA_BORDE_HOVER = QPen(QColor("#c53030"))
+_ALERTA_ACENTO = QColor("#c53030")
+_ALERTA_NOMBRE = QColor("#2d3748")
+
+_ALERTAS_VIEW_QSS = """
+    QListView { background: transparent; border: none; }
+    QScrollBar:vertical {
+        background: #f7fafc; width: 6px; border-radius: 3px;
+    }
+    QScrollBar::handle:vertical {
+        background: #cbd5e0; border-radius: 3px;
+    }
+"""
+
+# Rol del modelo de alertas con las unidades faltantes precalculadas
+_ROL_FALTANTE = Qt.UserRole + 1
+
+# Plantillas de texto del panel (format ligado, se llama por posición)
+_STOCK_ALERTA_FMT = "Stock: {} \u2022 Mín: {} (faltan {})".format
+_BADGE_FMT = "Notificaciones ({})".format
+
+
+# Clave de los nodos del trie de palabras que guarda las posiciones
+_FIN = ""
+
+
+def _trie_fuzzy(trie, palabra, max_dist):
+    """
+    Posiciones de las palabras del trie a distancia de edición <= max_dist
+    de palabra. Recorre el trie calculando una fila de Levenshtein por nodo
+    (los prefijos comunes se calculan una sola vez) y poda las ramas cuya
+    fila ya supera max_dist.
+    """
+    encontrados = set()
+    n = len(palabra)
+    fila_inicial = list(range(n + 1))
+    pila = [(hijo, letra, fila_inicial) for letra, hijo in trie.items() if letra != _FIN]
+    while pila:
+        nodo, letra, previa = pila.pop()
+        fila = [previa[0] + 1]
+        for i in range(1, n + 1):
+            costo = 0 if palabra[i - 1] == letra else 1
+            fila.append(min(fila[i - 1] + 1, previa[i] + 1, previa[i - 1] + costo))
+        if fila[n] <= max_dist and _FIN in nodo:
+            encontrados |= nodo[_FIN]
+        if min(fila) <= max_dist:
+            pila.extend((hijo, l, fila) for l, hijo in nodo.items() if l != _FIN)
+    return encontrados
+
+
+def _internar_textos(productos):
+    """
+    Interna unidad y categoría, que se repiten mucho entre productos, para
+    compartir una sola cadena por valor.
+    """
+    for p in productos:
+        if p.unidad_medida:
+            p.unidad_medida = sys.intern(p.unidad_medida)
+        if p.categoria_nombre:
+            p.categoria_nombre = sys.intern(p.categoria_nombre)
+
+
+# ============================================================================
+# WORKER PARA CARGAS DESDE LA BASE DE DATOS
+# ============================================================================
+class _LoadTaskSignals(QObject):
+    """Señales del worker (QRunnable no hereda de QObject)"""
+    finished = pyqtSignal(int, object, object)  # (generación, clave, resultado)
+    error = pyqtSignal(int, object, str)  # (generación, clave, mensaje)
+
+
+class _LoadTask(QRunnable):
+    """Ejecuta una consulta del repositorio en el QThreadPool global"""
+
+    def __init__(self, generation, key, fn, *args, **kwargs):
+        super().__init__()
+        self.generation = generation
+        self.key = key
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = _LoadTaskSignals()
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            resultado = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.error.emit(self.generation, self.key, str(e))
+            return
+        self.signals.finished.emit(self.generation, self.key, resultado)
+
+
+class _ImportWorker(QThread):
+    """Importa un archivo Excel en un hilo separado informando el avance por lotes"""
+    progreso = pyqtSignal(int, int)  # (filas procesadas, total)
+    terminado = pyqtSignal(object)  # stats de ExcelImporter.import_products
+    fallo = pyqtSignal(str)
+
+    def __init__(self, file_path):
+        super().__init__()
+        self.file_path = file_path
+        self._cancelado = False
+
+    def cancelar(self):
+        """Pide detener la importación; se atiende antes de la siguiente fila"""
+        self._cancelado = True
+
+    def run(self):
+        try:
+            stats = ExcelImporter().import_products(
+                self.file_path,
+                progress_callback=self.progreso.emit,
+                cancel_check=lambda: self._cancelado,
+            )
+        except Exception as e:
+            logger.error(f"Error en importación: {e}")
+            self.fallo.emit(str(e))
+            return
+        self.terminado.emit(stats)
+
+
+# ============================================================================
+# MODELO DE LA TABLA DE PRODUCTOS
+# ============================================================================
+class ProductosModel(QAbstractTableModel):
+    """
+    Modelo de tabla sobre la lista de productos.
+    Qt solo consulta data() para las celdas visibles, por lo que no se crea
+    ningún item por celda al recargar, buscar o filtrar.
+    """
+
+    HEADERS = (
+        "Seleccionar", "Código", "Nombre", "Categoría", "Precio", "Stock",
+        "Stock Mín.", "Unidad", "Marca"
+    )
+
+    # Texto a mostrar por columna (la columna 0 solo tiene checkbox)
+    _DISPLAY = (
+        None,
+        lambda p: p.codigo or "",
+        attrgetter("nombre"),
+        lambda p: p.categoria_nombre or "Sin categoría",
+        None,  # Precio, Stock y Stock Mín. salen de _textos()
+        None,
+        None,
+        attrgetter("unidad_medida"),
+        lambda p: p.marca or "",
+    )
+
+    # Columna -> posición en la entrada de _textos()
+    _COL_TEXTO = {4: 1, 5: 2, 6: 3}
+
+    # Filas pedidas por cada fetchMore en modo paginado
+    PAGE_SIZE = 500
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._checked_row = None  # Selección única mediante checkbox
+        self._fetch_page = None  # fetch_page(offset, limit) en modo paginado
+        self._total = 0
+        # producto.id -> (producto, precio, stock, stock mín., stock bajo)
+        self._cache_textos = {}
+
+    def _textos(self, producto):
+        """
+        Textos de las columnas numéricas y estado de stock bajo de un
+        producto, calculados una vez (data() se llama muchas veces por celda
+        al repintar). Si la fila pasó a ser otro objeto se recalculan.
+        """
+        entrada = self._cache_textos.get(producto.id)
+        if entrada is None or entrada[0] is not producto:
+            entrada = (
+                producto, producto.precio_formateado, str(producto.stock),
+                str(producto.stock_minimo), producto.stock_bajo
+            )
+            self._cache_textos[producto.id] = entrada
+        return entrada
+
+    def set_rows(self, rows, fetch_page=None, total=None):
+        """
+        Reemplaza las filas del modelo con un único reset.
+        Si se indica fetch_page, el resto de filas (hasta total) se pide por
+        páginas a medida que la vista hace scroll (canFetchMore/fetchMore).
+        """
+        self.beginResetModel()
+        self._rows = rows
+        self._cache_textos.clear()
+        self._checked_row = None
+        self._fetch_page = fetch_page
+        self._total = total if fetch_page is not None else len(rows)
+        self.endResetModel()
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._fetch_page is None:
+            return False
+        return len(self._rows) < self._total
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        inicio = len(self._rows)
+        lote = self._fetch_page(inicio, self.PAGE_SIZE)
+        if not lote:
+            self._total = inicio  # La BD tiene menos filas de las contadas
+            return
+        self.beginInsertRows(QModelIndex(), inicio, inicio + len(lote) - 1)
+        self._rows.extend(lote)
+        self.endInsertRows()
+
+    def append_row(self, producto):
+        """Agrega un producto al final notificando solo la fila nueva"""
+        n = len(self._rows)
+        self.beginInsertRows(QModelIndex(), n, n)
+        self._rows.append(producto)
+        self.endInsertRows()
+
+    def row_changed(self, row):
+        """Notifica que los datos de una fila cambiaron"""
+        self._cache_textos.pop(self._rows[row].id, None)
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.HEADERS) - 1))
+
+    def all_rows_changed(self):
+        """Notifica con un solo dataChanged que cambiaron todas las filas"""
+        self._cache_textos.clear()
+        if self._rows:
+            self.dataChanged.emit(
+                self.index(0, 0), self.index(len(self._rows) - 1, len(self.HEADERS) - 1)
+            )
+
+    def remove_row(self, row):
+        """Quita una fila notificando solo esa fila"""
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self._cache_textos.pop(self._rows[row].id, None)
+        del self._rows[row]
+        if self._checked_row is not None:
+            if self._checked_row == row:
+                self._checked_row = None
+            elif self._checked_row > row:
+                self._checked_row -= 1
+        self.endRemoveRows()
+
+    def producto_at(self, row):
+        """Retorna el producto de la fila indicada (o None si está fuera de rango)"""
+        if 0 <= row < len(self._rows):
+            return self._rows[row]
+        return None
+
+    def checked_row(self):
+        """Fila marcada con el checkbox de selección (o None)"""
+        return self._checked_row
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        col = index.column()
+
+        if role == Qt.DisplayRole:
+            pos = self._COL_TEXTO.get(col)
+            if pos is not None:
+                return self._textos(self._rows[index.row()])[pos]
+            getter = self._DISPLAY[col]
+            return getter(self._rows[index.row()]) if getter else None
+
+        if role == Qt.TextAlignmentRole:
+            return _ALIGN_BY_COL.get(col)
+
+        if role == Qt.CheckStateRole and col == 0:
+            return Qt.Checked if index.row() == self._checked_row else Qt.Unchecked
+
+        # Colorear stock si está bajo
+        if col == 5 and self._textos(self._rows[index.row()])[4]:
+            if role == Qt.BackgroundRole:
+                return _STOCK_BAJO_BG
+            if role == Qt.ForegroundRole:
+                return _STOCK_BAJO_FG
+
+        return None
+
+    def flags(self, index):
+        if index.isValid() and index.column() == 0:
+            return Qt.ItemIsUserCheckable | Qt.ItemIsEnabled
+        return super().flags(index)
+
+    def setData(self, index, value, role=Qt.EditRole):
+        """Marca/desmarca el checkbox de selección (solo uno a la vez)"""
+        if not index.isValid() or index.column() != 0 or role != Qt.CheckStateRole:
+            return False
+
+        row = index.row()
+        previo = self._checked_row
+        self._checked_row = row if value == Qt.Checked else None
+
+        # Desmarcar el anterior: solo se repinta esa celda
+        if previo is not None and previo != row:
+            prev_index = self.index(previo, 0)
+            self.dataChanged.emit(prev_index, prev_index, [Qt.CheckStateRole])
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        return True
+
+
+class _AlertasModel(QAbstractListModel):
+    """Lista de productos con stock bajo del panel de notificaciones"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._productos = ()
+        self._faltantes = ()
+
+    def set_productos(self, productos, faltantes=()):
+        """Reemplaza la lista completa (un solo reset del modelo)"""
+        self.beginResetModel()
+        self._productos = productos
+        self._faltantes = faltantes
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._productos)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        producto = self._productos[index.row()]
+        if role == Qt.UserRole:
+            return producto
+        if role == _ROL_FALTANTE:
+            return self._faltantes[index.row()]
+        if role == Qt.DisplayRole:
+            return producto.nombre
+        return None
+
+
+class _AlertaDelegate(QStyledItemDelegate):
+    """Pinta cada producto del panel como tarjeta (borde rojo a la izquierda)"""
+
+    ALTO = 60
+    ESPACIO = 8
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._font_nombre = QFont()
+        self._font_nombre.setPointSize(9)
+        self._font_nombre.setWeight(QFont.DemiBold)
+        self._font_stock = QFont()
+        self._font_stock.setPointSize(8)
+
+    def sizeHint(self, option, index):
+        return QSize(0, self.ALTO + self.ESPACIO)
+
+    def paint(self, painter, option, index):
+        producto = index.data(Qt.UserRole)
+        if producto is None:
+            return
+        hover = bool(option.state & QStyle.State_MouseOver)
+        rect = option.rect.adjusted(2, self.ESPACIO // 2, -2, -self.ESPACIO // 2)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(_ALERTA_BORDE_HOVER if hover else _ALERTA_BORDE)
+        painter.setBrush(_ALERTA_BG_HOVER if hover else _ALERTA_BG)
+        painter.drawRoundedRect(rect, 5, 5)
+        painter.fillRect(QRect(rect.left(), rect.top(), 3, rect.height()), _ALERTA_ACENTO)
+
+        texto = rect.adjusted(12, 6, -8, -6)
+        mitad = texto.height() // 2
+        arriba = QRect(texto.left(), texto.top(), texto.width(), mitad)
+        abajo = QRect(texto.left(), texto.top() + mitad, texto.width(), texto.height() - mitad)
+
+        painter.setFont(self._font_nombre)
+        painter.setPen(_ALERTA_NOMBRE)
+        nombre = painter.fontMetrics().elidedText(producto.nombre, Qt.ElideRight, arriba.width())
+        painter.drawText(arriba, Qt.AlignLeft | Qt.AlignVCenter, nombre)
+
+        painter.setFont(self._font_stock)
+        painter.setPen(_ALERTA_ACENTO)
+        painter.drawText(
+            abajo, Qt.AlignLeft | Qt.AlignVCenter,
+            _STOCK_ALERTA_FMT(
+                producto.stock, producto.stock_minimo, index.data(_ROL_FALTANTE)
+            )
+        )
+        painter.restore()
+
 
 class InventarioView(QWidget):
     """Vista principal de gestión de inventario"""
@@ -29,13 +450,48 @@ class InventarioView(QWidget):
     # Señales
     producto_seleccionado = pyqtSignal(Producto)
 
+    # Por encima de este número de productos los filtros vuelven a consultar la BD
+    CLIENT_FILTER_MAX = 50000
+
+    # Resultados de filtros resueltos en la BD que se conservan (LRU)
+    QUERY_CACHE_MAX = 32
+
+    # Filas que se miden en el ajuste único de anchos tras la primera carga
+    RESIZE_SAMPLE_ROWS = 200
+
+    # Largo mínimo de la búsqueda para intentar coincidencias con errores de tipeo
+    FUZZY_MIN_LEN = 4
+
+    # Ventana (ms) en la que se agrupan las actualizaciones del panel de alertas
+    ALERTAS_COALESCE_MS = 250
+
+    # Anchos de columna (px) para las columnas que no se estiran
+    COLUMN_WIDTHS = {0: 100, 1: 90, 3: 130, 4: 100, 5: 80, 6: 90, 7: 80}
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.producto_repo = ProductRepository()
         self.categoria_repo = CategoriaRepository()
+        self.proveedor_repo = ProveedorRepository()
         self.productos = []
+        self._search_index = []  # Texto en minúsculas por producto (mismo orden)
+        self._trigramas = {}  # trigrama -> ids de los productos que lo contienen
+        self._palabras_trie = None  # Trie de palabras (se construye al necesitarlo)
+        self._by_cat = {}  # categoria_id -> posiciones en self.productos
+        self._pos_by_id = {}  # id -> posición en self.productos
+        self._total_productos = 0  # Total en BD (puede superar len(self.productos))
+        self._combo_firma = None  # (id, nombre) de las categorías del combo
+        self._anchos_ajustados = False
+        self._filter_request = 0  # Descarta resultados de filtros superados
+        self._query_cache = OrderedDict()  # (texto, categoria_id, solo_bajo) -> resultados
+        self._import_worker = None
+        self._import_progress = None
         self.productos_actuales = []  # Para manejar filtros correctamente
         self.categorias = []
+        self._load_generation = 0
+        self._current_row = -1  # Fila seleccionada (cacheada en on_selection_changed)
+        self._producto_dialog = None  # ProductoDialog reutilizable (creación perezosa)
+        self._pending_loads = {}
         self.setup_ui()
         self.cargar_datos()
 
@@ -112,7 +568,12 @@ class InventarioView(QWidget):
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Buscar por nombre, código o marca...")
         self.search_input.setMinimumHeight(40)
-        self.search_input.textChanged.connect(self.buscar_productos)
+        # Debounce: solo se busca cuando el usuario deja de escribir 200 ms
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(200)
+        self._search_timer.timeout.connect(self._do_search)
+        self.search_input.textChanged.connect(lambda _: self._search_timer.start())
         layout.addWidget(self.search_input, stretch=4)
 
         # Estilo unificado para desplegables (con flechitas)
@@ -159,7 +620,7 @@ class InventarioView(QWidget):
         self.categoria_filter = QComboBox()
         self.categoria_filter.addItem("Todas las categorías", None)
         self.categoria_filter.setStyleSheet(combo_style)
-        self.categoria_filter.currentIndexChanged.connect(self.filtrar_por_categoria)
+        self.categoria_filter.currentIndexChanged.connect(self._apply_filters)
         layout.addWidget(self.categoria_filter, stretch=1)
 
         # Filtro de stock bajo (Botón con Menú)
@@ -242,27 +703,28 @@ class InventarioView(QWidget):
 
     def create_products_table(self):
         """Crea la tabla de productos"""
-        table = QTableWidget()
-        table.setColumnCount(9)
-        table.setHorizontalHeaderLabels([
-            "Seleccionar", "Código", "Nombre", "Categoría", "Precio", "Stock",
-            "Stock Mín.", "Unidad", "Marca"
-        ])
+        self.model = ProductosModel(self)
+        table = QTableView()
+        table.setModel(self.model)
 
         # Configurar tabla
         table.setAlternatingRowColors(True)
-        table.setSelectionBehavior(QTableWidget.SelectRows)
-        table.setSelectionMode(QTableWidget.SingleSelection)
-        table.setEditTriggers(QTableWidget.NoEditTriggers)
+        table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        table.setSelectionMode(QAbstractItemView.SingleSelection)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         table.verticalHeader().setVisible(False)
 
-        # Ajuste de columnas y estilos
+        # Ajuste de columnas y estilos: anchos fijos en lugar de ResizeToContents,
+        # que mide el texto de todas las filas en cada recarga
         header = table.horizontalHeader()
-        header.setSectionResizeMode(QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(QHeaderView.Interactive)
+        # El ajuste único tras la primera carga mide solo una muestra de filas
+        header.setResizeContentsPrecision(self.RESIZE_SAMPLE_ROWS)
+        for col, ancho in self.COLUMN_WIDTHS.items():
+            table.setColumnWidth(col, ancho)
 
         # Selección Centrada
         header.setSectionResizeMode(0, QHeaderView.Fixed)
-        table.setColumnWidth(0, 100)
 
         # Distribución Proporcional
         header.setSectionResizeMode(2, QHeaderView.Stretch)      # Nombre se expande más
@@ -271,135 +733,482 @@ class InventarioView(QWidget):
 
         # CSS para centrar checkboxes
         table.setStyleSheet("""
-            QTableWidget::indicator {
+            QTableView::indicator {
                 subcontrol-origin: padding;
                 subcontrol-position: center;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 5px;
             }
         """)
 
         # Conectar señales
-        table.itemSelectionChanged.connect(self.on_selection_changed)
+        table.selectionModel().selectionChanged.connect(self.on_selection_changed)
         table.doubleClicked.connect(self.editar_producto)
-        table.itemChanged.connect(self.on_item_changed)
 
         return table
 
     def cargar_datos(self):
-        """Carga los datos desde la base de datos"""
-        try:
-            # Cargar categorías
-            self.categorias = self.categoria_repo.get_all()
-            self.actualizar_combo_categorias()
+        """
+        Carga categorías y productos desde la base de datos.
+        Ambas consultas corren en paralelo en el QThreadPool, cada una con su
+        propia conexión del pool; la vista se actualiza cuando llegan las dos.
+        """
+        self._load_generation += 1
+        self._pending_loads = {}
+        # Los datos pueden haber cambiado: se descartan filtros en curso y cacheados
+        self._filter_request += 1
+        self._query_cache.clear()
+        self.status_label.setText("Cargando...")
+
+        for key, fn in (
+            ("categorias", self.categoria_repo.get_all),
+            ("productos", self._cargar_productos_inicial),
+        ):
+            task = _LoadTask(self._load_generation, key, fn)
+            task.signals.finished.connect(self._on_load_finished)
+            task.signals.error.connect(self._on_load_error)
+            QThreadPool.globalInstance().start(task)
+
+    def _cargar_productos_inicial(self):
+        """
+        Corre en el worker: retorna (total, productos, índices). Inventarios
+        grandes solo traen la primera página (sin índices); el resto llega
+        con el scroll.
+        """
+        total = self.producto_repo.count()
+        if total > self.CLIENT_FILTER_MAX:
+            productos = self.producto_repo.get_page(0, ProductosModel.PAGE_SIZE)
+            _internar_textos(productos)
+            return total, productos, None
+        productos = self.producto_repo.get_all()
+        _internar_textos(productos)
+        return total, productos, self._construir_indices(productos)
+
+    @classmethod
+    def _construir_indices(cls, productos):
+        """
+        Retorna (textos de búsqueda, trigramas, categoria_id -> posiciones,
+        id -> posición) de productos. No usa el estado de la vista, así que
+        corre en el worker junto con la consulta.
+        """
+        search_index = []
+        trigramas = {}
+        by_cat = {}
+        pos_by_id = {}
+        for i, p in enumerate(productos):
+            texto = cls._texto_busqueda(p)
+            search_index.append(texto)
+            for k in range(len(texto) - 2):
+                trigramas.setdefault(texto[k:k + 3], set()).add(p.id)
+            by_cat.setdefault(p.categoria_id, []).append(i)
+            pos_by_id[p.id] = i
+        return search_index, trigramas, by_cat, pos_by_id
+
+    def _fetch_page(self, offset, limit):
+        """Trae una página de productos para el modelo en modo paginado"""
+        lote = self.producto_repo.get_page(offset, limit)
+        _internar_textos(lote)
+        return lote
+
+    def _is_large(self):
+        """True si el inventario supera el límite para trabajar en memoria"""
+        return self._total_productos > self.CLIENT_FILTER_MAX
+
+    def _on_load_finished(self, generation, key, resultado):
+        """Recibe el resultado de una carga; aplica los datos cuando están ambos"""
+        if generation != self._load_generation:
+            return  # Carga superada por otra más reciente
+
+        self._pending_loads[key] = resultado
+        if len(self._pending_loads) < 2:
+            return
 
-            # Cargar productos
-            self.productos = self.producto_repo.get_all()
-            self.actualizar_tabla()
+        # Cargar categorías
+        self.categorias = self._pending_loads["categorias"]
+        self.actualizar_combo_categorias()
+        if self._producto_dialog is not None:
+            self._producto_dialog.set_categorias(self.categorias)
+
+        # Cargar productos
+        self._total_productos, self.productos, indices = self._pending_loads["productos"]
+        self._palabras_trie = None
+        if indices is None:
+            # Los filtros usan la BD; no se indexa una lista parcial
+            self._search_index = []
+            self._trigramas = {}
+            self._by_cat = {}
+            self._pos_by_id = {}
+        else:
+            # Índices ya construidos en el worker
+            self._search_index, self._trigramas, self._by_cat, self._pos_by_id = indices
 
-            self.status_label.setText(f" {len(self.productos)} productos cargados")
-        except Exception as e:
-            logger.error(f"Error al cargar datos: {e}")
-            QMessageBox.critical(self, "Error", f"Error al cargar datos:\n{str(e)}")
+        self.status_label.setText(f" {self._total_productos} productos cargados")
+        # El combo conserva la categoría elegida: se reaplican los filtros
+        # activos (sin filtros equivale a actualizar_tabla())
+        self._apply_filters()
+
+        if not self._anchos_ajustados and self.productos:
+            self._ajustar_anchos_columnas()
+
+    def _ajustar_anchos_columnas(self):
+        """
+        Ajusta una sola vez, tras la primera carga con datos, las columnas de
+        ancho fijo a su contenido (nunca por debajo del ancho predefinido).
+        """
+        self._anchos_ajustados = True
+        for col, ancho in self.COLUMN_WIDTHS.items():
+            if col == 0:
+                continue  # Columna del checkbox: ancho fijo
+            self.table.resizeColumnToContents(col)
+            if self.table.columnWidth(col) < ancho:
+                self.table.setColumnWidth(col, ancho)
+
+    def _on_load_error(self, generation, key, mensaje):
+        """Informa un error de carga (una sola vez por generación)"""
+        if generation != self._load_generation:
+            return
+
+        # Invalidar la generación para ignorar el resultado de la otra consulta
+        self._load_generation += 1
+        logger.error(f"Error al cargar datos ({key}): {mensaje}")
+        self.status_label.setText("Error al cargar datos")
+        QMessageBox.critical(self, "Error", f"Error al cargar datos:\n{mensaje}")
+
+    @staticmethod
+    def _texto_busqueda(p):
+        """Texto en minúsculas de un producto para la búsqueda en memoria"""
+        return (
+            f"{(p.codigo or '').lower()}\x1f{p.nombre.lower()}\x1f"
+            f"{(p.marca or '').lower()}\x1f{(p.descripcion or '').lower()}"
+        )
+
+    def _indexar_trigramas(self, producto_id, texto):
+        """Registra el producto bajo cada trigrama de su texto de búsqueda"""
+        trigramas = self._trigramas
+        for k in range(len(texto) - 2):
+            trigramas.setdefault(texto[k:k + 3], set()).add(producto_id)
+
+    def _desindexar_trigramas(self, producto_id, texto):
+        """Quita el producto de los trigramas de su texto de búsqueda"""
+        trigramas = self._trigramas
+        for k in range(len(texto) - 2):
+            ids = trigramas.get(texto[k:k + 3])
+            if ids is not None:
+                ids.discard(producto_id)
+
+    def _candidatos_fuzzy(self, texto):
+        """
+        Posiciones cuyo texto tiene, para cada palabra buscada, una palabra
+        a distancia de edición 1 (palabras cortas) o 2 (desde 6 letras).
+        """
+        if self._palabras_trie is None:
+            trie = {}
+            for i, texto_producto in enumerate(self._search_index):
+                for palabra in texto_producto.replace("\x1f", " ").split():
+                    nodo = trie
+                    for letra in palabra:
+                        nodo = nodo.setdefault(letra, {})
+                    nodo.setdefault(_FIN, set()).add(i)
+            self._palabras_trie = trie
+
+        resultado = None
+        for palabra in texto.split():
+            if len(palabra) < 3:
+                continue  # Demasiado corta para tolerar errores
+            max_dist = 1 if len(palabra) <= 5 else 2
+            posiciones = _trie_fuzzy(self._palabras_trie, palabra, max_dist)
+            resultado = posiciones if resultado is None else resultado & posiciones
+            if not resultado:
+                return set()
+        return resultado or set()
+
+    def _candidatos_texto(self, texto):
+        """
+        Posiciones que contienen todos los trigramas de texto (superconjunto
+        de las coincidencias por subcadena). None si texto es muy corto
+        para acotar y hay que recorrer todo.
+        """
+        if len(texto) < 3:
+            return None
+        conjuntos = []
+        for k in range(len(texto) - 2):
+            posiciones = self._trigramas.get(texto[k:k + 3])
+            if not posiciones:
+                return set()
+            conjuntos.append(posiciones)
+        conjuntos.sort(key=len)
+        pos_by_id = self._pos_by_id
+        return {pos_by_id[i] for i in conjuntos[0].intersection(*conjuntos[1:])}
+
+    def _rebuild_by_cat(self):
+        """
+        Construye los índices categoria_id -> posiciones e id -> posición
+        sobre self.productos
+        """
+        self._by_cat = {}
+        self._pos_by_id = {}
+        for i, p in enumerate(self.productos):
+            self._by_cat.setdefault(p.categoria_id, []).append(i)
+            self._pos_by_id[p.id] = i
+
+    def _indice_producto(self, producto_id):
+        """Posición del producto en self.productos (o None si no está cargado)"""
+        return self._pos_by_id.get(producto_id)
+
+    def _sin_filtros(self):
+        """True si la tabla muestra directamente self.productos"""
+        return self.productos_actuales is self.productos
+
+    def _producto_agregado(self, producto):
+        """Incorpora un producto recién creado sin recargar todo el inventario"""
+        if self._is_large():
+            self.cargar_datos()  # Lista parcial (paginada): se recarga
+            return
+        _internar_textos([producto])
+        texto = self._texto_busqueda(producto)
+        self._indexar_trigramas(producto.id, texto)
+        self._search_index.append(texto)
+        self._palabras_trie = None
+        self._by_cat.setdefault(producto.categoria_id, []).append(len(self.productos))
+        self._pos_by_id[producto.id] = len(self.productos)
+        if self._sin_filtros():
+            self.model.append_row(producto)  # Misma lista que self.productos
+        else:
+            self.productos.append(producto)
+            self._apply_filters()
+        self.status_label.setText(f" {len(self.productos)} productos cargados")
+
+    def _producto_actualizado(self, producto):
+        """Reemplaza un producto editado y refresca solo su fila"""
+        if self._is_large():
+            self.cargar_datos()  # Lista parcial (paginada): se recarga
+            return
+        idx = self._indice_producto(producto.id)
+        if idx is None:
+            self.cargar_datos()
+            return
+        _internar_textos([producto])
+        cambio_categoria = self.productos[idx].categoria_id != producto.categoria_id
+        self.productos[idx] = producto
+        texto = self._texto_busqueda(producto)
+        self._desindexar_trigramas(producto.id, self._search_index[idx])
+        self._indexar_trigramas(producto.id, texto)
+        self._search_index[idx] = texto
+        self._palabras_trie = None
+        if cambio_categoria:
+            self._rebuild_by_cat()
+        if self._sin_filtros():
+            self.model.row_changed(idx)
+        else:
+            self._apply_filters()
+
+    def _producto_eliminado(self, producto_id):
+        """Quita un producto eliminado y notifica solo su fila"""
+        if self._is_large():
+            self.cargar_datos()  # Lista parcial (paginada): se recarga
+            return
+        idx = self._indice_producto(producto_id)
+        if idx is None:
+            self.cargar_datos()
+            return
+        if self._sin_filtros():
+            self.model.remove_row(idx)  # Misma lista que self.productos
+        else:
+            del self.productos[idx]
+        # Los trigramas guardan ids: solo se quita el producto eliminado.
+        # Las posiciones posteriores a idx se desplazan un lugar
+        self._desindexar_trigramas(producto_id, self._search_index.pop(idx))
+        self._palabras_trie = None
+        del self._pos_by_id[producto_id]
+        for i in range(idx, len(self.productos)):
+            self._pos_by_id[self.productos[i].id] = i
+        for posiciones in self._by_cat.values():
+            posiciones[:] = [i - 1 if i > idx else i for i in posiciones if i != idx]
+        if not self._sin_filtros():
+            self._apply_filters()
+        self.status_label.setText(f" {len(self.productos)} productos cargados")
+
+    def _stock_minimo_global_aplicado(self, nuevo_minimo):
+        """Refleja en memoria un stock mínimo global sin recargar de la BD"""
+        if self._is_large():
+            self.cargar_datos()  # Lista parcial (paginada): se recarga
+            return
+        for p in self.productos:
+            p.stock_minimo = nuevo_minimo
+        if self._sin_filtros():
+            self.model.all_rows_changed()
+        else:
+            self._apply_filters()  # El filtro de stock bajo puede cambiar
 
     def actualizar_combo_categorias(self):
         """Actualiza el combo de categorías"""
-        self.categoria_filter.clear()
-        self.categoria_filter.addItem("Todas las categorías", None)
-        for cat in self.categorias:
-            self.categoria_filter.addItem(cat.nombre, cat.id)
+        firma = tuple((c.id, c.nombre) for c in self.categorias)
+        if firma == self._combo_firma:
+            return  # Mismas categorías: no hace falta repoblar
+
+        # clear()/addItem emiten currentIndexChanged, que relanzaría los filtros
+        # por cada item; se repuebla en bloque sin señales ni repintado
+        seleccionada = self.categoria_filter.currentData()
+        with QSignalBlocker(self.categoria_filter):
+            self.categoria_filter.setUpdatesEnabled(False)
+            try:
+                self.categoria_filter.clear()
+                self.categoria_filter.addItem("Todas las categorías", None)
+                for cat in self.categorias:
+                    self.categoria_filter.addItem(cat.nombre, cat.id)
+                # Conservar la categoría elegida si sigue existiendo
+                idx = self.categoria_filter.findData(seleccionada)
+                self.categoria_filter.setCurrentIndex(max(idx, 0))
+            finally:
+                self.categoria_filter.setUpdatesEnabled(True)
+        self._combo_firma = firma
 
     def actualizar_tabla(self, productos=None):
         """Actualiza la tabla con los productos"""
+        paginado = productos is None and self._is_large()
         if productos is None:
             productos = self.productos
 
         self.productos_actuales = productos
-        self.table.setRowCount(len(productos))
-
-        for row, producto in enumerate(productos):
-            # Checkbox de selección
-            chk_item = QTableWidgetItem()
-            chk_item.setFlags(Qt.ItemIsUserCheckable | Qt.ItemIsEnabled)
-            chk_item.setCheckState(Qt.Unchecked)
-            self.table.setItem(row, 0, chk_item)
-
-            # Código
-            self.table.setItem(row, 1, QTableWidgetItem(producto.codigo or ""))
-
-            # Nombre
-            self.table.setItem(row, 2, QTableWidgetItem(producto.nombre))
-
-            # Categoría
-            self.table.setItem(row, 3, QTableWidgetItem(producto.categoria_nombre or "Sin categoría"))
-
-            # Precio
-            precio_item = QTableWidgetItem(producto.precio_formateado)
-            precio_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            self.table.setItem(row, 4, precio_item)
-
-            # Stock
-            stock_item = QTableWidgetItem(str(producto.stock))
-            stock_item.setTextAlignment(Qt.AlignCenter)
-            # Colorear si está bajo
-            if producto.stock_bajo:
-                stock_item.setBackground(QColor("#f38ba8"))
-                stock_item.setForeground(QColor("#1e1e2e"))
-            self.table.setItem(row, 5, stock_item)
-
-            # Stock mínimo
-            stock_min_item = QTableWidgetItem(str(producto.stock_minimo))
-            stock_min_item.setTextAlignment(Qt.AlignCenter)
-            self.table.setItem(row, 6, stock_min_item)
-
-            # Unidad
-            self.table.setItem(row, 7, QTableWidgetItem(producto.unidad_medida))
-
-            # Marca
-            self.table.setItem(row, 8, QTableWidgetItem(producto.marca or ""))
-
-        # En la header de la tabla ya se configuró el auto-ajuste
-        # self.table.resizeColumnsToContents() # Eliminado para evitar smashed columns iniciales
-
-    def buscar_productos(self, texto):
-        """Busca productos por texto"""
-        if not texto.strip():
-            self.actualizar_tabla()
-            return
 
+        # Un solo repintado al terminar el reset del modelo
+        self.table.setUpdatesEnabled(False)
         try:
-            resultados = self.producto_repo.search(texto)
-            self.actualizar_tabla(resultados)
-            self.status_label.setText(f"🔍 {len(resultados)} resultado(s) encontrado(s)")
-        except Exception as e:
-            logger.error(f"Error en búsqueda: {e}")
+            if paginado:
+                self.model.set_rows(productos, self._fetch_page, self._total_productos)
+            else:
+                self.model.set_rows(productos)
+        finally:
+            self.table.setUpdatesEnabled(True)
+
+        # El reset del modelo limpia la selección sin emitir selectionChanged
+        self.on_selection_changed()
+
+    def _do_search(self):
+        """Ejecuta la búsqueda con el texto actual (tras el debounce)"""
+        self._apply_filters()
 
-    def filtrar_por_categoria(self, index):
-        """Filtra productos por categoría"""
+    def _apply_filters(self):
+        """
+        Aplica texto + categoría + stock bajo en una sola pasada sobre
+        self.productos, de modo que los filtros se combinan entre sí.
+        """
+        texto = self.search_input.text().lower().strip()
         categoria_id = self.categoria_filter.currentData()
+        solo_bajo = self.action_ver_stock_bajo.isChecked()
+
+        # Invalida cualquier consulta de filtro en curso
+        self._filter_request += 1
 
-        if categoria_id is None:
+        if not texto and categoria_id is None and not solo_bajo:
             self.actualizar_tabla()
-        else:
-            try:
-                productos = self.producto_repo.get_by_categoria(categoria_id)
-                self.actualizar_tabla(productos)
-                self.status_label.setText(f"📁 {len(productos)} producto(s) en esta categoría")
-            except Exception as e:
-                logger.error(f"Error al filtrar: {e}")
+            return
 
-    def filtrar_stock_bajo(self, checked):
-        """Filtra productos con stock bajo"""
-        if checked:
-            try:
-                productos = self.producto_repo.get_low_stock() # Usamos el método correcto del repo
-                self.actualizar_tabla(productos)
-                self.status_label.setText(f" ⚠️ {len(productos)} producto(s) con stock bajo")
-            except Exception as e:
-                logger.error(f"Error al filtrar stock bajo: {e}")
+        if self._is_large():
+            # Inventario muy grande: la consulta a la BD corre en el
+            # QThreadPool; solo se muestra el resultado del último filtro
+            clave = (texto, categoria_id, solo_bajo)
+            if clave in self._query_cache:
+                self._query_cache.move_to_end(clave)
+                self._mostrar_filtrados(self._query_cache[clave])
+                return
+            task = _LoadTask(
+                self._filter_request, clave, self._filtrar_en_bd,
+                texto, categoria_id, solo_bajo
+            )
+            task.signals.finished.connect(self._on_filter_finished)
+            task.signals.error.connect(self._on_filter_error)
+            QThreadPool.globalInstance().start(task)
+            return
+
+        try:
+            productos = self.productos
+            index = self._search_index
+            # El índice de trigramas y el de categorías acotan los candidatos
+            por_texto = self._candidatos_texto(texto) if texto else None
+            if categoria_id is None:
+                candidatos = range(len(productos)) if por_texto is None else sorted(por_texto)
+            else:
+                candidatos = self._by_cat.get(categoria_id, ())
+                if por_texto is not None:
+                    candidatos = [i for i in candidatos if i in por_texto]
+            posiciones = [
+                i for i in candidatos
+                if (not texto or texto in index[i])
+                and (not solo_bajo or productos[i].stock_bajo)
+            ]
+            if (not posiciones and len(texto) >= self.FUZZY_MIN_LEN
+                    and not any(c.isdigit() for c in texto)):
+                # Sin coincidencias exactas: se buscan las que tienen errores
+                # de tipeo ("martilo" -> "martillo"). No se aplica a códigos
+                # (con dígitos), donde "PROD001" no debe traer "PROD002"
+                posiciones = [
+                    i for i in sorted(self._candidatos_fuzzy(texto))
+                    if (categoria_id is None or productos[i].categoria_id == categoria_id)
+                    and (not solo_bajo or productos[i].stock_bajo)
+                ]
+            resultados = [productos[i] for i in posiciones]
+
+            if solo_bajo:
+                # Mismo orden que get_low_stock (stock ascendente)
+                resultados.sort(key=lambda p: p.stock)
+
+            self._mostrar_filtrados(resultados)
+        except Exception as e:
+            logger.error(f"Error al filtrar productos: {e}")
+
+    def _filtrar_en_bd(self, texto, categoria_id, solo_bajo):
+        """
+        Corre en el worker: el primer filtro activo lo resuelve la BD y los
+        demás se aplican sobre ese resultado.
+        """
+        ordenar = solo_bajo
+        if texto:
+            productos = self.producto_repo.search(texto)
+        elif categoria_id is not None:
+            productos = self.producto_repo.get_by_categoria(categoria_id)
+            categoria_id = None
         else:
-            self.actualizar_tabla()
+            productos = self.producto_repo.get_low_stock()
+            solo_bajo = False
+        _internar_textos(productos)
+
+        resultados = [
+            p for p in productos
+            if (categoria_id is None or p.categoria_id == categoria_id)
+            and (not solo_bajo or p.stock_bajo)
+        ]
+        if ordenar:
+            # Mismo orden que get_low_stock (stock ascendente)
+            resultados.sort(key=lambda p: p.stock)
+        return resultados
+
+    def _on_filter_finished(self, request, key, resultados):
+        """Muestra el resultado de un filtro resuelto en la BD si sigue vigente"""
+        if request != self._filter_request:
+            return  # Filtro superado por otro más reciente
+        self._query_cache[key] = resultados
+        if len(self._query_cache) > self.QUERY_CACHE_MAX:
+            self._query_cache.popitem(last=False)
+        self._mostrar_filtrados(resultados)
+
+    def _on_filter_error(self, request, key, mensaje):
+        """Registra el error de un filtro resuelto en la BD"""
+        if request == self._filter_request:
+            logger.error(f"Error al filtrar productos: {mensaje}")
+
+    def _mostrar_filtrados(self, resultados):
+        """Muestra los productos filtrados y el resumen en la barra de estado"""
+        self.actualizar_tabla(resultados)
+
+        n = len(resultados)
+        if self.search_input.text().strip():
+            self.status_label.setText(f"🔍 {n} resultado(s) encontrado(s)")
+        elif self.categoria_filter.currentData() is not None:
+            self.status_label.setText(f"📁 {n} producto(s) en esta categoría")
+        else:
+            self.status_label.setText(f" ⚠️ {n} producto(s) con stock bajo")
 
     def setup_stock_bajo_menu(self):
         """Configura el menú desplegable del botón Stock Bajo"""
@@ -424,7 +1233,7 @@ class InventarioView(QWidget):
         # Acción: Ver productos en stock bajo (filtro)
         self.action_ver_stock_bajo = QAction("Ver productos con bajo stock", self)
         self.action_ver_stock_bajo.setCheckable(True)
-        self.action_ver_stock_bajo.triggered.connect(lambda: self.filtrar_stock_bajo(self.action_ver_stock_bajo.isChecked()))
+        self.action_ver_stock_bajo.triggered.connect(self._apply_filters)
         menu.addAction(self.action_ver_stock_bajo)
 
         menu.addSeparator()
@@ -473,11 +1282,9 @@ class InventarioView(QWidget):
         if dialog.exec_() == QDialog.Accepted:
             nuevo_minimo = spin.value()
             try:
-                # Iterar y actualizar todos los productos
-                for p in self.productos:
-                    p.stock_minimo = nuevo_minimo
-                    self.producto_repo.update(p)
-                self.cargar_datos()
+                # Un único UPDATE en una sola transacción
+                self.producto_repo.set_stock_minimo_bulk(nuevo_minimo)
+                self._stock_minimo_global_aplicado(nuevo_minimo)
                 QMessageBox.information(self, "Éxito", f"Se actualizó el stock mínimo a {nuevo_minimo} para todos los productos.")
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"No se pudo actualizar el stock global:\n{str(e)}")
@@ -522,18 +1329,20 @@ class InventarioView(QWidget):
         layout.addLayout(buttons)
 
         if dialog.exec_() == QDialog.Accepted:
-            producto.stock_minimo = spin.value()
             try:
-                self.producto_repo.update(producto)
-                self.cargar_datos()
+                actualizado = self.producto_repo.update(
+                    replace(producto, stock_minimo=spin.value())
+                )
+                self._producto_actualizado(actualizado)
                 QMessageBox.information(self, "Éxito", "Configuración guardada.")
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Error al guardar:\n{str(e)}")
 
     def on_selection_changed(self):
         """Maneja el cambio de selección en la tabla"""
-        selected_rows = self.table.selectionModel().selectedRows()
-        has_selection = len(selected_rows) > 0
+        has_selection = self.table.selectionModel().hasSelection()
+        # Selección simple: se guarda la fila para no consultar el selectionModel luego
+        self._current_row = self.table.currentIndex().row() if has_selection else -1
         self.btn_editar.setEnabled(has_selection)
         self.btn_eliminar.setEnabled(has_selection)
 
@@ -541,50 +1350,30 @@ class InventarioView(QWidget):
         if hasattr(self, 'action_individual'):
             self.action_individual.setEnabled(has_selection)
 
-    def on_item_changed(self, item):
-        """Maneja el cambio en una celda (para los checkboxes de selección única)"""
-        if item.column() == 0:
-            if item.checkState() == Qt.Checked:
-                # Desmarcar los demás
-                self.table.blockSignals(True)
-                for row in range(self.table.rowCount()):
-                    if row != item.row():
-                        other_item = self.table.item(row, 0)
-                        if other_item:
-                            other_item.setCheckState(Qt.Unchecked)
-                self.table.blockSignals(False)
-
-            # Actualizar estado de botones basado en si hay algún checkbox marcado
-            hay_marcado = False
-            for row in range(self.table.rowCount()):
-                check_item = self.table.item(row, 0)
-                if check_item and check_item.checkState() == Qt.Checked:
-                    hay_marcado = True
-                    break
-
-            # Podríamos habilitar/deshabilitar botones aquí si fuera necesario
-            pass
-
     def get_selected_producto(self):
         """Obtiene el producto seleccionado mediante el checkbox"""
-        for row in range(self.table.rowCount()):
-            item = self.table.item(row, 0)
-            if item and item.checkState() == Qt.Checked:
-                if row < len(self.productos_actuales):
-                    return self.productos_actuales[row]
+        checked = self.model.checked_row()
+        if checked is not None and checked < len(self.productos_actuales):
+            return self.productos_actuales[checked]
 
         # Fallback para botones Editar/Eliminar si usan la selección estándar de fila
-        selected_rows = self.table.selectionModel().selectedRows()
-        if selected_rows:
-            row = selected_rows[0].row()
-            if row < len(self.productos_actuales):
-                return self.productos_actuales[row]
+        row = self._current_row
+        if 0 <= row < len(self.productos_actuales):
+            return self.productos_actuales[row]
 
         return None
 
+    def _get_producto_dialog(self, producto=None):
+        """Retorna el diálogo de producto (creado una sola vez) listo para usar"""
+        if self._producto_dialog is None:
+            self._producto_dialog = ProductoDialog(self.categorias, producto=producto, parent=self)
+        else:
+            self._producto_dialog.reset(producto)
+        return self._producto_dialog
+
     def agregar_producto(self):
         """Abre el diálogo para agregar un producto"""
-        dialog = ProductoDialog(self.categorias, parent=self)
+        dialog = self._get_producto_dialog()
         if dialog.exec_() == QDialog.Accepted:
             try:
                 producto = dialog.get_producto()
@@ -593,12 +1382,10 @@ class InventarioView(QWidget):
                 proveedor_id = dialog.get_proveedor_id_seleccionado()
                 if proveedor_id and producto_creado.id:
                     try:
-                        from app.infrastructure.proveedor_repository import ProveedorRepository
-                        prov_repo = ProveedorRepository()
-                        prov_repo.asignar_proveedor_a_producto(producto_creado.id, proveedor_id)
+                        self.proveedor_repo.asignar_proveedor_a_producto(producto_creado.id, proveedor_id)
                     except Exception as pe:
                         logger.warning(f"No se pudo asignar proveedor al producto: {pe}")
-                self.cargar_datos()
+                self._producto_agregado(producto_creado)
                 QMessageBox.information(self, "Éxito", "Producto agregado correctamente")
             except Exception as e:
                 logger.error(f"Error al agregar producto: {e}")
@@ -610,24 +1397,22 @@ class InventarioView(QWidget):
         if not producto:
             return
 
-        dialog = ProductoDialog(self.categorias, producto=producto, parent=self)
+        dialog = self._get_producto_dialog(producto)
         if dialog.exec_() == QDialog.Accepted:
             try:
                 producto_actualizado = dialog.get_producto()
                 producto_actualizado.id = producto.id
-                self.producto_repo.update(producto_actualizado)
+                producto_actualizado = self.producto_repo.update(producto_actualizado)
                 # ✅ NUEVO: actualizar relación con proveedor
                 proveedor_id = dialog.get_proveedor_id_seleccionado()
                 try:
-                    from app.infrastructure.proveedor_repository import ProveedorRepository
-                    prov_repo = ProveedorRepository()
                     if proveedor_id:
-                        prov_repo.asignar_proveedor_a_producto(producto.id, proveedor_id)
+                        self.proveedor_repo.asignar_proveedor_a_producto(producto.id, proveedor_id)
                     else:
-                        prov_repo.remover_proveedor_de_producto(producto.id)
+                        self.proveedor_repo.remover_proveedor_de_producto(producto.id)
                 except Exception as pe:
                     logger.warning(f"No se pudo actualizar proveedor del producto: {pe}")
-                self.cargar_datos()
+                self._producto_actualizado(producto_actualizado)
                 QMessageBox.information(self, "Éxito", "Producto actualizado correctamente")
             except Exception as e:
                 logger.error(f"Error al actualizar producto: {e}")
@@ -649,7 +1434,7 @@ class InventarioView(QWidget):
         if respuesta == QMessageBox.Yes:
             try:
                 self.producto_repo.delete(producto.id, soft_delete=True)
-                self.cargar_datos()
+                self._producto_eliminado(producto.id)
                 QMessageBox.information(self, "Éxito", "Producto eliminado correctamente")
             except Exception as e:
                 logger.error(f"Error al eliminar producto: {e}")
@@ -663,21 +1448,48 @@ class InventarioView(QWidget):
 
         if not file_path:
             return
+        if self._import_worker is not None and self._import_worker.isRunning():
+            return
 
+        # Progreso indeterminado hasta que llegue el primer lote
+        self._import_progress = QProgressDialog("Importando productos...", "Cancelar", 0, 0, self)
+        self._import_progress.setWindowModality(Qt.WindowModal)
+        self._import_progress.setMinimumDuration(0)
+        self._import_progress.setAutoClose(False)
+        self._import_progress.setAutoReset(False)
+
+        # La importación corre fuera del hilo de la interfaz
+        self._import_worker = _ImportWorker(file_path)
+        self._import_worker.progreso.connect(self._on_import_progress)
+        self._import_worker.terminado.connect(self._on_import_finished)
+        self._import_worker.fallo.connect(self._on_import_error)
+        self._import_progress.canceled.connect(self._on_import_cancel)
+        self._import_progress.show()
+        self._import_worker.start()
+
+    def _on_import_cancel(self):
+        """El usuario canceló: el worker se detiene antes de la siguiente fila"""
+        self._import_progress.setLabelText("Cancelando importación...")
+        self._import_progress.show()  # Sigue visible hasta que el worker termine
+        self._import_worker.cancelar()
+
+    def _on_import_progress(self, procesadas, total):
+        """Actualiza la barra de progreso tras cada lote guardado"""
+        self._import_progress.setMaximum(total)
+        self._import_progress.setValue(procesadas)
+
+    def _cerrar_progreso_import(self):
+        """Cierra el diálogo de progreso (close() emitiría canceled)"""
+        self._import_progress.canceled.disconnect(self._on_import_cancel)
+        self._import_progress.close()
+
+    def _on_import_finished(self, stats):
+        """Muestra el resumen de la importación y recarga el inventario"""
+        self._cerrar_progreso_import()
         try:
-            importer = ExcelImporter()
-
-            # Mostrar progreso indeterminado
-            progress = QProgressDialog("Importando productos...", "Cancelar", 0, 0, self)
-            progress.setWindowModality(Qt.WindowModal)
-            progress.show()
-
-            # Ejecutar importación
-            stats = importer.import_products(file_path)
-            progress.cancel()
-
+            titulo = "Importación cancelada" if stats.get('cancelled') else "Importación completada"
             mensaje = (
-                f"Importación completada.\n\n"
+                f"{titulo}.\n\n"
                 f"Total procesado: {stats['total']}\n"
                 f"✅ Éxitos: {stats['success']} (Creados: {stats['created']}, Actualizados: {stats['updated']})\n"
                 f"❌ Errores: {len(stats['errors'])}"
@@ -692,6 +1504,11 @@ class InventarioView(QWidget):
         except Exception as e:
             logger.error(f"Error en importación: {e}")
             QMessageBox.critical(self, "Error", f"Error al importar archivo:\n{str(e)}")
+
+    def _on_import_error(self, mensaje):
+        """Informa un error general de la importación"""
+        self._cerrar_progreso_import()
+        QMessageBox.critical(self, "Error", f"Error al importar archivo:\n{mensaje}")
     # =========================================================================
     # ✅ Panel lateral colapsable de Notificaciones de stock
     # =========================================================================
@@ -749,29 +1566,30 @@ class InventarioView(QWidget):
         sep.setStyleSheet("background-color: #e2e8f0; max-height: 1px;")
         v.addWidget(sep)
 
-        # Área scrollable
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setFrameShape(QFrame.NoFrame)
-        scroll.setStyleSheet("""
-            QScrollArea { background: transparent; border: none; }
-            QScrollBar:vertical {
-                background: #f7fafc; width: 6px; border-radius: 3px;
-            }
-            QScrollBar::handle:vertical {
-                background: #cbd5e0; border-radius: 3px;
-            }
-        """)
-
-        self._alertas_container = QWidget()
-        self._alertas_container.setStyleSheet("background: transparent;")
-        self._alertas_layout = QVBoxLayout(self._alertas_container)
-        self._alertas_layout.setSpacing(8)     # ✅ más espacio entre tarjetas
-        self._alertas_layout.setContentsMargins(2, 4, 2, 4)
-        self._alertas_layout.addStretch()
+        # Lista de productos: modelo + delegado (una sola vista para N alertas)
+        self._alertas_model = _AlertasModel(self)
+        self._alertas_view = QListView()
+        self._alertas_view.setModel(self._alertas_model)
+        self._alertas_view.setItemDelegate(_AlertaDelegate(self._alertas_view))
+        self._alertas_view.setUniformItemSizes(True)
+        self._alertas_view.setSelectionMode(QAbstractItemView.NoSelection)
+        self._alertas_view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self._alertas_view.setFrameShape(QFrame.NoFrame)
+        self._alertas_view.setStyleSheet(_ALERTAS_VIEW_QSS)
+        self._alertas_view.viewport().setAttribute(Qt.WA_Hover)
+        self._alertas_view.viewport().setCursor(Qt.PointingHandCursor)
+        # Clic en cualquier fila — abre el diálogo con TODOS los productos actuales
+        self._alertas_view.clicked.connect(
+            lambda _index: self._abrir_autorizacion_desde_panel()
+        )
+        self._alertas_view.hide()
+        v.addWidget(self._alertas_view, 1)
 
-        scroll.setWidget(self._alertas_container)
-        v.addWidget(scroll)
+        # Mensaje de panel vacío: se crea una vez y solo se muestra/oculta
+        self._empty_lbl = QLabel("Sin notificaciones")
+        self._empty_lbl.setStyleSheet("color: #a0aec0; font-size: 9pt;")
+        self._empty_lbl.setAlignment(Qt.AlignHCenter | Qt.AlignTop)
+        v.addWidget(self._empty_lbl, 1)
 
         hint = QLabel("Clic en un producto para actuar")
         hint.setStyleSheet(
@@ -781,109 +1599,95 @@ class InventarioView(QWidget):
         hint.setWordWrap(True)
         v.addWidget(hint)
 
-        self._productos_alerta_actual = []
+        self._productos_alerta_actual = ()
+        # Ventana con el usuario autenticado (se resuelve en el primer clic)
+        self._auth_parent = None
+
+        # Actualizaciones seguidas del monitor se agrupan en un solo refresco
+        self._pending_alertas = None
+        self._alertas_timer = QTimer(self)
+        self._alertas_timer.setSingleShot(True)
+        self._alertas_timer.setInterval(self.ALERTAS_COALESCE_MS)
+        self._alertas_timer.timeout.connect(self._flush_alertas)
         return panel
 
     def actualizar_panel_alertas(self, productos: list) -> None:
         """
         Refresca el contenido del panel con los productos con stock bajo.
         Cada tarjeta es clickeable y abre el diálogo de autorización.
+        Los productos se muestran del más urgente (más unidades faltantes)
+        al menos urgente.
+
+        Las llamadas dentro de ALERTAS_COALESCE_MS se agrupan: solo se
+        muestra la última lista recibida.
         """
-        # Guardar lista actual para uso en clics
-        self._productos_alerta_actual = list(productos)
+        self._pending_alertas = productos
+        if not self._alertas_timer.isActive():
+            self._alertas_timer.start()
+
+    def _flush_alertas(self) -> None:
+        """Aplica al panel la última lista de productos pendiente."""
+        productos = self._pending_alertas
+        self._pending_alertas = None
+        if productos is None:
+            return
+
+        # Guardar lista actual (tupla inmutable, en el orden recibido) para
+        # uso en clics: el diálogo toma el proveedor de productos[0]
+        self._productos_alerta_actual = (
+            productos if isinstance(productos, tuple) else tuple(productos)
+        )
 
-        # Limpiar items existentes (excepto stretch final)
-        while self._alertas_layout.count() > 1:
-            item = self._alertas_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+        # Solo el panel se ordena por urgencia, con el faltante calculado una
+        # vez por producto (estable: a igual faltante se respeta el orden)
+        pares = sorted(
+            ((max(0, p.stock_minimo - p.stock), p) for p in productos),
+            key=itemgetter(0), reverse=True
+        )
+        self._mostrar_alertas(
+            tuple(map(itemgetter(1), pares)), tuple(map(itemgetter(0), pares))
+        )
 
         if not productos:
-            empty = QLabel("Sin notificaciones")
-            empty.setStyleSheet("color: #a0aec0; font-size: 9pt;")
-            empty.setAlignment(Qt.AlignCenter)
-            self._alertas_layout.insertWidget(0, empty)
             self._btn_alertas.setText("Notificaciones (0)")
             self._btn_alertas.setChecked(False)
             self._panel_alertas.setVisible(False)
             return
 
         n = len(productos)
-        self._btn_alertas.setText(f"Notificaciones ({n})")
-
-        for i, producto in enumerate(productos):
-            faltante = max(0, producto.stock_minimo - producto.stock)
-
-            # Tarjeta como QPushButton clickeable
-            card = QPushButton()
-            card.setCursor(Qt.PointingHandCursor)
-            card.setFixedHeight(60)   # ✅ altura fija para que no se amontonen
-            card.setStyleSheet("""
-                QPushButton {
-                    background-color: #fff5f0;
-                    border: 1px solid #fed7d7;
-                    border-left: 3px solid #c53030;
-                    border-radius: 5px;
-                    padding: 8px 10px;
-                    text-align: left;
-                }
-                QPushButton:hover {
-                    background-color: #fee2e2;
-                    border-color: #c53030;
-                }
-            """)
-
-            card_layout = QVBoxLayout(card)
-            card_layout.setSpacing(2)
-            card_layout.setContentsMargins(4, 4, 4, 4)
-
-            name_lbl = QLabel(producto.nombre)
-            name_lbl.setStyleSheet(
-                "color: #2d3748; font-size: 9pt; font-weight: 600;"
-                "background: transparent; border: none;"
-            )
-            name_lbl.setWordWrap(True)
-            card_layout.addWidget(name_lbl)
-
-            stock_lbl = QLabel(
-                f"Stock: {producto.stock} \u2022 Mín: {producto.stock_minimo} "
-                f"(faltan {faltante})"
-            )
-            stock_lbl.setStyleSheet(
-                "color: #c53030; font-size: 8pt; background: transparent; border: none;"
-            )
-            card_layout.addWidget(stock_lbl)
-
-            # Conectar clic — abre el diálogo con TODOS los productos actuales
-            card.clicked.connect(self._abrir_autorizacion_desde_panel)
-
-            self._alertas_layout.insertWidget(i, card)
+        self._btn_alertas.setText(_BADGE_FMT(n))
 
         logger.debug(f"Panel notificaciones actualizado: {n} producto(s)")
 
+    def _mostrar_alertas(self, productos, faltantes=()) -> None:
+        """Carga los productos en la lista (o muestra el mensaje de vacío)."""
+        self._alertas_model.set_productos(productos, faltantes)
+        self._alertas_view.setVisible(bool(productos))
+        self._empty_lbl.setVisible(not productos)
+
     def _abrir_autorizacion_desde_panel(self) -> None:
         """Abre el diálogo de autorización de pedido desde una tarjeta del panel."""
+        global _AlertaAutorizacionDialog
         if not self._productos_alerta_actual:
             return
         try:
-            from app.presentation.components.alerta_autorizacion_dialog import (
-                AlertaAutorizacionDialog
-            )
+            if _AlertaAutorizacionDialog is None:
+                from app.presentation.components.alerta_autorizacion_dialog import (
+                    AlertaAutorizacionDialog as _AlertaAutorizacionDialog
+                )
             # Obtener usuario autenticado desde la ventana principal
-            authenticated_user = None
-            parent = self.parent()
-            if parent and hasattr(parent, 'authenticated_user'):
-                authenticated_user = parent.authenticated_user
+            authenticated_user = getattr(
+                self._resolver_auth_parent(), 'authenticated_user', None
+            )
 
-            dialog = AlertaAutorizacionDialog(
+            dialog = _AlertaAutorizacionDialog(
                 productos=self._productos_alerta_actual,
                 authenticated_user=authenticated_user,
                 parent=self,
             )
-            if dialog.exec_() == AlertaAutorizacionDialog.Accepted:
+            if dialog.exec_() == _AlertaAutorizacionDialog.Accepted:
                 pedido = dialog.get_pedido_creado()
                 if pedido:
-                    from PyQt5.QtWidgets import QMessageBox
                     QMessageBox.information(
                         self,
                         "Pedido Creado",
@@ -894,33 +1698,39 @@ class InventarioView(QWidget):
         except Exception as e:
             logger.error(f"Error al abrir diálogo de autorización desde panel: {e}")
 
+    def _resolver_auth_parent(self):
+        """
+        Busca (una vez) el ancestro que expone authenticated_user. La vista
+        se crea sin padre y se inserta luego en un QStackedWidget, por eso se
+        recorre la jerarquía en el primer uso y no en __init__.
+        """
+        if self._auth_parent is None:
+            widget = self.parentWidget()
+            while widget is not None and not hasattr(widget, 'authenticated_user'):
+                widget = widget.parentWidget()
+            self._auth_parent = widget
+        return self._auth_parent
+
     def _limpiar_panel(self) -> None:
         """
-        Elimina todas las tarjetas del panel, vacía la lista interna,
+        Quita todos los productos del panel, vacía la lista interna,
         resetea el badge a (0) y oculta el panel.
         El monitor de stock las volverá a añadir en el siguiente ciclo
         si el stock sigue estando bajo.
         """
-        # 1. Eliminar todas las tarjetas del layout (excepto el stretch final)
-        while self._alertas_layout.count() > 1:
-            item = self._alertas_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-
-        # 2. Vaciar lista interna
-        self._productos_alerta_actual = []
-
-        # 3. Mostrar mensaje vacío
-        empty = QLabel("Sin notificaciones")
-        empty.setStyleSheet("color: #a0aec0; font-size: 9pt;")
-        empty.setAlignment(Qt.AlignCenter)
-        self._alertas_layout.insertWidget(0, empty)
-
-        # 4. Resetear badge
+        # 1. Vaciar lista interna (y descartar un refresco pendiente)
+        self._alertas_timer.stop()
+        self._pending_alertas = None
+        self._productos_alerta_actual = ()
+
+        # 2. Vaciar la lista y mostrar el mensaje "Sin notificaciones"
+        self._mostrar_alertas(())
+
+        # 3. Resetear badge
         self._btn_alertas.setText("Notificaciones (0)")
         self._btn_alertas.setChecked(False)
 
-        # 5. Ocultar panel
+        # 4. Ocultar panel
         self._panel_alertas.setVisible(False)
         logger.debug("Panel notificaciones limpiado completamente por el usuario")
 
@@ -931,6 +1741,21 @@ class InventarioView(QWidget):
         logger.debug(f"Panel notificaciones {'visible' if visible else 'oculto'}")
 
 
+class _LazyComboBox(QComboBox):
+    """QComboBox que avisa la primera vez que el usuario lo va a usar"""
+
+    primer_uso = pyqtSignal()
+
+    def showPopup(self):
+        self.primer_uso.emit()
+        super().showPopup()
+
+    def focusInEvent(self, event):
+        # Cubre también la navegación con teclado sin abrir la lista
+        self.primer_uso.emit()
+        super().focusInEvent(event)
+
+
 class ProductoDialog(QDialog):
 
     """Diálogo para agregar/editar productos"""
@@ -941,7 +1766,8 @@ class ProductoDialog(QDialog):
         self.producto = producto
         self.is_edit = producto is not None
         self.proveedor_repo = ProveedorRepository()   # ✅ NUEVO
-        self.proveedores = self.proveedor_repo.get_all()  # ✅ NUEVO: carga proveedores activos
+        # Proveedores activos: se consultan al usar el combo (None = sin cargar)
+        self.proveedores = None
         self.setup_ui()
 
         if self.is_edit:
@@ -975,9 +1801,7 @@ class ProductoDialog(QDialog):
 
         # Categoría
         self.categoria_combo = QComboBox()
-        self.categoria_combo.addItem("Sin categoría", None)
-        for cat in self.categorias:
-            self.categoria_combo.addItem(cat.nombre, cat.id)
+        self._poblar_categorias()
         form_layout.addRow("Categoría:", self.categoria_combo)
 
         # Precio
@@ -1021,10 +1845,9 @@ class ProductoDialog(QDialog):
         form_layout.addRow("Marca:", self.marca_input)
 
         # ✅ NUEVO: Proveedor
-        self.proveedor_combo = QComboBox()
-        self.proveedor_combo.addItem("-- Sin proveedor --", None)
-        for prov in self.proveedores:
-            self.proveedor_combo.addItem(prov.nombre, prov.id)
+        self.proveedor_combo = _LazyComboBox()
+        self.proveedor_combo.primer_uso.connect(self._cargar_proveedores)
+        self._poblar_proveedores()
         self.proveedor_combo.setToolTip(
             "Proveedor principal de este producto.\n"
             "Aparecerá al generar pedidos automáticos."
@@ -1053,6 +1876,67 @@ class ProductoDialog(QDialog):
 
         layout.addLayout(buttons_layout)
 
+    def _poblar_categorias(self):
+        """Llena el combo de categorías a partir de self.categorias"""
+        with QSignalBlocker(self.categoria_combo):
+            self.categoria_combo.clear()
+            self.categoria_combo.addItem("Sin categoría", None)
+            for cat in self.categorias:
+                self.categoria_combo.addItem(cat.nombre, cat.id)
+
+    def _poblar_proveedores(self):
+        """Llena el combo de proveedores a partir de self.proveedores"""
+        with QSignalBlocker(self.proveedor_combo):
+            self.proveedor_combo.clear()
+            self.proveedor_combo.addItem("-- Sin proveedor --", None)
+            for prov in self.proveedores or ():
+                self.proveedor_combo.addItem(prov.nombre, prov.id)
+
+    def _cargar_proveedores(self):
+        """Consulta los proveedores la primera vez que se necesitan"""
+        if self.proveedores is not None:
+            return
+        try:
+            self.proveedores = self.proveedor_repo.get_all_cached()
+        except Exception as e:
+            logger.error(f"Error al cargar proveedores: {e}")
+            return
+        self._poblar_proveedores()
+
+    def set_categorias(self, categorias):
+        """Actualiza las categorías disponibles (p. ej. tras recargar datos)"""
+        self.categorias = categorias
+        self._poblar_categorias()
+
+    def reset(self, producto=None):
+        """
+        Prepara el diálogo para reutilizarlo: limpia el formulario o carga
+        el producto indicado, sin reconstruir los widgets.
+        """
+        self.producto = producto
+        self.is_edit = producto is not None
+        self.setWindowTitle("Editar Producto" if self.is_edit else "Agregar Producto")
+
+        # Los proveedores pueden cambiar entre aperturas (vista Proveedores):
+        # se vuelven a leer (de la caché del repositorio) cuando se use el combo
+        self.proveedores = None
+        self._poblar_proveedores()
+
+        self.codigo_input.clear()
+        self.nombre_input.clear()
+        self.descripcion_input.clear()
+        self.precio_input.setValue(0)
+        self.stock_input.setValue(0)
+        self.stock_min_input.setValue(5)
+        self.unidad_input.setCurrentText("unidad")
+        self.marca_input.clear()
+        self.ubicacion_input.clear()
+        self.categoria_combo.setCurrentIndex(0)
+        self.proveedor_combo.setCurrentIndex(0)
+
+        if self.is_edit:
+            self.load_producto_data()
+
     def load_producto_data(self):
         """Carga los datos del producto en el formulario"""
         self.codigo_input.setText(self.producto.codigo or "")
@@ -1075,6 +1959,7 @@ class ProductoDialog(QDialog):
         try:
             proveedor = self.proveedor_repo.get_proveedor_de_producto(self.producto.id)
             if proveedor:
+                self._cargar_proveedores()
                 idx = self.proveedor_combo.findData(proveedor.id)
                 if idx >= 0:
                     self.proveedor_combo.setCurrentIndex(idx)
@@ -1087,7 +1972,7 @@ class ProductoDialog(QDialog):
             codigo=self.codigo_input.text().strip() or None,
             nombre=self.nombre_input.text().strip(),
             descripcion=self.descripcion_input.toPlainText().strip() or None,
-            precio=Decimal(str(self.precio_input.value())),
+            precio=Decimal(self.precio_input.value()).quantize(_CENTS),
             stock=self.stock_input.value(),
             stock_minimo=self.stock_min_input.value(),
             unidad_medida=self.unidad_input.currentText(),
@@ -6,24 +6,128 @@ from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
     QPushButton, QMessageBox
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
 from PyQt5.QtGui import QFont
 import hashlib
+import hmac
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Parámetros de scrypt para las credenciales almacenadas
+_SCRYPT_N = 2 ** 14
+_SCRYPT_R = 8
+_SCRYPT_P = 1
+_SCRYPT_DKLEN = 32
+
+# Estilos del diálogo (compartidos entre aperturas)
+_INPUT_QSS = """
+    QLineEdit {
+        padding: 11px 14px;
+        font-size: 11pt;
+        border: 1.5px solid #d4d4ce;
+        border-radius: 10px;
+        background-color: #ffffff;
+    }
+    QLineEdit:focus {
+        border-color: #cc785c;
+    }
+"""
+
+_CANCEL_QSS = """
+    QPushButton {
+        padding: 11px 24px;
+        font-size: 11pt;
+        background-color: #fafaf8;
+        color: #4a4a44;
+        border: 1px solid #d4d4ce;
+        border-radius: 10px;
+    }
+    QPushButton:hover {
+        background-color: #f0f0ea;
+    }
+"""
+
+_LOGIN_QSS = """
+    QPushButton {
+        padding: 11px 24px;
+        font-size: 11pt;
+        font-weight: 600;
+        background-color: #cc785c;
+        color: #ffffff;
+        border: none;
+        border-radius: 10px;
+    }
+    QPushButton:hover {
+        background-color: #d68a6e;
+    }
+    QPushButton:pressed {
+        background-color: #b86a50;
+    }
+"""
+
+
+def _derivar_clave(password: str, salt: bytes) -> bytes:
+    """Deriva la clave de la contraseña con scrypt"""
+    return hashlib.scrypt(
+        password.encode(), salt=salt,
+        n=_SCRYPT_N, r=_SCRYPT_R, p=_SCRYPT_P, dklen=_SCRYPT_DKLEN
+    )
+
+
+class _LoginWorkerSignals(QObject):
+    """Señales del verificador de credenciales"""
+    terminado = pyqtSignal(str, bool)  # (usuario, válido)
+
+
+class _LoginWorker(QRunnable):
+    """Verifica la contraseña fuera del hilo de la UI (scrypt es costoso a propósito)"""
+
+    def __init__(self, username: str, password: str, credencial, existe: bool):
+        super().__init__()
+        self.username = username
+        self.password = password
+        self.credencial = credencial
+        self.existe = existe
+        self.signals = _LoginWorkerSignals()
+
+    @pyqtSlot()
+    def run(self):
+        salt_hex, hash_hex = self.credencial
+        try:
+            derivada = _derivar_clave(self.password, bytes.fromhex(salt_hex))
+            # Comparación en tiempo constante
+            valido = hmac.compare_digest(derivada, bytes.fromhex(hash_hex)) and self.existe
+        except Exception as e:
+            logger.error(f"Error al verificar credenciales: {e}")
+            valido = False
+        self.signals.terminado.emit(self.username, valido)
 
 
 class LoginDialog(QDialog):
     """Diálogo de inicio de sesión para personal de la ferretería"""
 
-    # Credenciales por defecto (en producción deberían estar en BD)
+    # Credenciales por defecto (en producción deberían estar en BD).
+    # (salt, clave scrypt) en hexadecimal, precalculados.
     USERS = {
-        "admin": hashlib.sha256("admin123".encode()).hexdigest(),
-        "personal": hashlib.sha256("ferreteria2024".encode()).hexdigest(),
+        "admin": (
+            "725a8a228d9baf4c75eec2fac93372c3",
+            "09fb1658fcf7f37632808288ef21388774a06dcd0f3410d777828d3f8fea09de",
+        ),
+        "personal": (
+            "3467574d0505f05768fbcdc313b29ce4",
+            "063eda30e54ab2ed7bead5aa7b34b06672b30eccdd72bb3e2517625fa6221f04",
+        ),
     }
 
+    # Credencial usada si el usuario no existe (mismo costo de derivación)
+    _CREDENCIAL_INEXISTENTE = ("00" * 16, "00" * _SCRYPT_DKLEN)
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.authenticated = False
         self.username = None
+        self._verificando = False
         self.setup_ui()
 
     def setup_ui(self):
@@ -60,18 +164,7 @@ class LoginDialog(QDialog):
         self.username_input = QLineEdit()
         self.username_input.setPlaceholderText("Ingrese su usuario")
         self.username_input.setMinimumHeight(40)
-        self.username_input.setStyleSheet("""
-            QLineEdit {
-                padding: 11px 14px;
-                font-size: 11pt;
-                border: 1.5px solid #d4d4ce;
-                border-radius: 10px;
-                background-color: #ffffff;
-            }
-            QLineEdit:focus {
-                border-color: #cc785c;
-            }
-        """)
+        self.username_input.setStyleSheet(_INPUT_QSS)
         layout.addWidget(self.username_input)
 
         layout.addSpacing(6)
@@ -85,18 +178,7 @@ class LoginDialog(QDialog):
         self.password_input.setPlaceholderText("Ingrese su contraseña")
         self.password_input.setEchoMode(QLineEdit.Password)
         self.password_input.setMinimumHeight(40)
-        self.password_input.setStyleSheet("""
-            QLineEdit {
-                padding: 11px 14px;
-                font-size: 11pt;
-                border: 1.5px solid #d4d4ce;
-                border-radius: 10px;
-                background-color: #ffffff;
-            }
-            QLineEdit:focus {
-                border-color: #cc785c;
-            }
-        """)
+        self.password_input.setStyleSheet(_INPUT_QSS)
         self.password_input.returnPressed.connect(self.login)
         layout.addWidget(self.password_input)
 
@@ -108,49 +190,24 @@ class LoginDialog(QDialog):
 
         cancel_btn = QPushButton("Cancelar")
         cancel_btn.setMinimumHeight(40)
-        cancel_btn.setStyleSheet("""
-            QPushButton {
-                padding: 11px 24px;
-                font-size: 11pt;
-                background-color: #fafaf8;
-                color: #4a4a44;
-                border: 1px solid #d4d4ce;
-                border-radius: 10px;
-            }
-            QPushButton:hover {
-                background-color: #f0f0ea;
-            }
-        """)
+        cancel_btn.setStyleSheet(_CANCEL_QSS)
         cancel_btn.clicked.connect(self.reject)
         buttons_layout.addWidget(cancel_btn)
 
-        login_btn = QPushButton("Iniciar Sesión")
-        login_btn.setObjectName("primaryButton")
-        login_btn.setMinimumHeight(40)
-        login_btn.setStyleSheet("""
-            QPushButton {
-                padding: 11px 24px;
-                font-size: 11pt;
-                font-weight: 600;
-                background-color: #cc785c;
-                color: #ffffff;
-                border: none;
-                border-radius: 10px;
-            }
-            QPushButton:hover {
-                background-color: #d68a6e;
-            }
-            QPushButton:pressed {
-                background-color: #b86a50;
-            }
-        """)
-        login_btn.clicked.connect(self.login)
-        buttons_layout.addWidget(login_btn)
+        self.login_btn = QPushButton("Iniciar Sesión")
+        self.login_btn.setObjectName("primaryButton")
+        self.login_btn.setMinimumHeight(40)
+        self.login_btn.setStyleSheet(_LOGIN_QSS)
+        self.login_btn.clicked.connect(self.login)
+        buttons_layout.addWidget(self.login_btn)
 
         layout.addLayout(buttons_layout)
 
     def login(self):
         """Valida las credenciales e inicia sesión"""
+        if self._verificando:
+            return
+
         username = self.username_input.text().strip()
         password = self.password_input.text()
 
@@ -162,10 +219,25 @@ class LoginDialog(QDialog):
             )
             return
 
-        # Validar credenciales
-        password_hash = hashlib.sha256(password.encode()).hexdigest()
+        # Validar credenciales en segundo plano
+        self._set_verificando(True)
+        credencial = self.USERS.get(username, self._CREDENCIAL_INEXISTENTE)
+        worker = _LoginWorker(username, password, credencial, username in self.USERS)
+        worker.signals.terminado.connect(self._on_login_verificado)
+        QThreadPool.globalInstance().start(worker)
+
+    def _set_verificando(self, activo: bool):
+        """Bloquea el formulario mientras se verifican las credenciales"""
+        self._verificando = activo
+        self.username_input.setEnabled(not activo)
+        self.password_input.setEnabled(not activo)
+        self.login_btn.setEnabled(not activo)
+        self.login_btn.setText("Verificando..." if activo else "Iniciar Sesión")
 
-        if username in self.USERS and self.USERS[username] == password_hash:
+    def _on_login_verificado(self, username: str, valido: bool):
+        """Resultado de la verificación de credenciales"""
+        self._set_verificando(False)
+        if valido:
             self.authenticated = True
             self.username = username
             self.accept()
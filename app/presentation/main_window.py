@@ -227,21 +227,26 @@ class MainWindow(QMainWindow):
         self.asistente_view = AsistenteView()
         self.stacked_widget.addWidget(self.asistente_view)  # index 0
 
-        # Vista de Inventario – requiere autenticación
-        self.inventario_view = InventarioView()
-        self.stacked_widget.addWidget(self.inventario_view)  # index 1
-
-        # Vista de Pedidos – requiere autenticación
-        self.pedidos_view = PedidosView(authenticated_user=self.authenticated_user)
-        self.stacked_widget.addWidget(self.pedidos_view)  # index 2
-
-        # Vista de Historial – requiere autenticación
-        self.historial_view = HistorialView()
-        self.stacked_widget.addWidget(self.historial_view)  # index 3
-
-        # Vista de Proveedores – requiere autenticación
-        self.proveedores_view = ProveedoresView()
-        self.stacked_widget.addWidget(self.proveedores_view)  # index 4
+        # Vistas protegidas (requieren autenticación): se construyen en la
+        # primera navegación. Índice lógico -> (atributo, constructor)
+        self._view_factories = {
+            1: ("inventario_view", InventarioView),
+            2: ("pedidos_view",
+                lambda: PedidosView(authenticated_user=self.authenticated_user)),
+            3: ("historial_view", HistorialView),
+            4: ("proveedores_view", ProveedoresView),
+        }
+        self.inventario_view = None
+        self.pedidos_view = None
+        self.historial_view = None
+        self.proveedores_view = None
+
+        # Alertas recibidas antes de crear la vista de inventario (su panel)
+        self._alertas_pendientes = None
+
+        # Índice lógico -> vista creada / posición en el stack
+        self._view_instances = {0: self.asistente_view}
+        self._stack_index = {0: self.stacked_widget.indexOf(self.asistente_view)}
 
         # Mostrar vista del asistente por defecto
         self.cambiar_vista(0)
@@ -272,19 +277,39 @@ class MainWindow(QMainWindow):
             self.actualizar_botones_navegacion(index)
             self.statusBar().showMessage("Vista: Chat con Gabo")
 
+    def _get_vista(self, index):
+        """Devuelve la vista del índice lógico, creándola en el primer uso."""
+        vista = self._view_instances.get(index)
+        if vista is None:
+            atributo, constructor = self._view_factories[index]
+            vista = constructor()
+            self._view_instances[index] = vista
+            self._stack_index[index] = self.stacked_widget.addWidget(vista)
+            setattr(self, atributo, vista)
+            logger.debug(f"Vista creada bajo demanda: {atributo}")
+            if index == 1 and self._alertas_pendientes is not None:
+                vista.actualizar_panel_alertas(self._alertas_pendientes)
+                self._alertas_pendientes = None
+        return vista
+
     def mostrar_vista_protegida(self, index):
-        """Muestra vista protegida tras autenticación."""
-        self.stacked_widget.setCurrentIndex(index)
+        """Muestra vista protegida tras autenticación (la crea si hace falta)."""
+        creada_ahora = index not in self._view_instances
+        vista = self._get_vista(index)
+        self.stacked_widget.setCurrentIndex(self._stack_index[index])
         self.actualizar_botones_navegacion(index)
 
         if index == 1:
             self.statusBar().showMessage(f"Vista: Gestión de Inventario | Usuario: {self.authenticated_user}")
         elif index == 2:
             self.statusBar().showMessage(f"Vista: Pedidos | Usuario: {self.authenticated_user}")
+            # El usuario puede haber cambiado desde que se creó la vista
+            vista.authenticated_user = self.authenticated_user
         elif index == 3:
             self.statusBar().showMessage(f"Vista: Historial de Conversaciones | Usuario: {self.authenticated_user}")
-            if hasattr(self, 'historial_view'):
-                self.historial_view.load_conversations()
+            # Recién creada ya cargó las conversaciones en su __init__
+            if not creada_ahora:
+                vista.load_conversations()
         elif index == 4:
             self.statusBar().showMessage(f"Vista: Proveedores | Usuario: {self.authenticated_user}")
 
@@ -405,9 +430,9 @@ class MainWindow(QMainWindow):
 
     def refrescar_datos(self):
         """Refresca los datos de la vista actual"""
-        index = self.stacked_widget.currentIndex()
+        vista = self.stacked_widget.currentWidget()
 
-        if index == 1:  # Vista de inventario
+        if vista is not None and vista is self.inventario_view:  # Vista de inventario
             self.inventario_view.cargar_datos()
             self.statusBar().showMessage(" Datos actualizados", 3000)
         else:
@@ -452,8 +477,12 @@ class MainWindow(QMainWindow):
             f"Monitor: {len(productos)} alerta(s) de stock → panel y popup"
         )
 
-        # 1. Actualizar el panel lateral siempre
-        self.inventario_view.actualizar_panel_alertas(productos)
+        # 1. Actualizar el panel lateral siempre. Vive en la vista de
+        #    inventario: si aún no se creó, se aplica al crearla
+        if self.inventario_view is not None:
+            self.inventario_view.actualizar_panel_alertas(productos)
+        else:
+            self._alertas_pendientes = productos
 
         # 2. Mostrar popup solo si hay sesión activa
         if not self.authenticated_user:
@@ -23,16 +23,25 @@ class ExcelImporter:
         'Código', 'Stock Mínimo', 'Marca', 'Ubicación', 'Descripción'
     ]
 
+    # Filas por transacción (por debajo del límite de variables de SQLite)
+    BATCH_SIZE = 500
+
     def __init__(self):
         self.product_repo = ProductRepository()
         self.category_repo = CategoriaRepository()
 
-    def import_products(self, file_path):
+    def import_products(self, file_path, progress_callback=None, cancel_check=None):
         """
         Importa productos desde un archivo Excel.
+        Los productos se guardan por lotes de BATCH_SIZE, un lote por transacción.
 
         Args:
             file_path (str): Ruta al archivo .xlsx
+            progress_callback (callable): Opcional, recibe (filas_procesadas, total)
+                tras guardar cada lote
+            cancel_check (callable): Opcional, se consulta antes de cada fila; si
+                retorna True se detiene la importación (los lotes ya guardados se
+                conservan y el lote pendiente se descarta)
 
         Returns:
             dict: Resumen de la importación {'total': int, 'success': int, 'errors': list}
@@ -42,7 +51,8 @@ class ExcelImporter:
             'success': 0,
             'updated': 0,
             'created': 0,
-            'errors': []
+            'errors': [],
+            'cancelled': False
         }
 
         try:
@@ -62,13 +72,36 @@ class ExcelImporter:
             # Obtener todos los productos existentes para comparar por nombre
             existing_products = {p.nombre.lower(): p for p in self.product_repo.get_all(solo_activos=False)}
 
-            for index, row in df.iterrows():
+            # Lote pendiente: clave -> (índice de fila, producto, filas repetidas).
+            # Las repetidas se cuentan como actualizadas solo al guardar el lote
+            nuevos = {}  # por nombre en minúsculas
+            existentes = {}  # por ID
+
+            # Columnas numéricas convertidas una sola vez (vectorizado); los
+            # valores no numéricos quedan como NaN y se reportan por fila
+            precios = pd.to_numeric(df['Precio'], errors='coerce').tolist()
+            stocks = pd.to_numeric(df['Stock'], errors='coerce').tolist()
+
+            # Filas como diccionarios: mucho más livianas que iterrows()
+            filas = zip(df.index, df.to_dict('records'), precios, stocks)
+
+            for index, row, precio, stock in filas:
+                if cancel_check and cancel_check():
+                    stats['cancelled'] = True
+                    nuevos.clear()
+                    existentes.clear()
+                    logger.info(f"Importación cancelada en la fila {index + 2}")
+                    break
+
                 try:
                     # Datos básicos
                     nombre = str(row['Nombre']).strip()
                     cat_nombre = str(row['Categoría']).strip()
-                    precio = float(row['Precio'])
-                    stock = int(row['Stock'])
+                    if pd.isna(precio):
+                        raise ValueError(f"Precio inválido: {row['Precio']}")
+                    if pd.isna(stock):
+                        raise ValueError(f"Stock inválido: {row['Stock']}")
+                    stock = int(stock)
                     unidad = str(row['Unidad']).strip()
 
                     if not nombre or not cat_nombre:
@@ -110,9 +143,23 @@ class ExcelImporter:
                         existing_product.categoria_id = categoria.id
                         existing_product.activo = True
 
-                        self.product_repo.update(existing_product)
-                        stats['updated'] += 1
-                        logger.info(f"Producto actualizado: {nombre}")
+                        # Repetido en el mismo lote: la última fila manda
+                        pendiente = existentes.get(existing_product.id)
+                        repetidas = pendiente[2] + 1 if pendiente else 0
+                        existentes[existing_product.id] = (index, existing_product, repetidas)
+                    elif nombre.lower() in nuevos:
+                        # Repetido en el mismo lote: la última fila manda
+                        _, pendiente, repetidas = nuevos[nombre.lower()]
+                        pendiente.codigo = codigo
+                        pendiente.precio = Decimal(str(precio))
+                        pendiente.stock = stock
+                        pendiente.unidad_medida = unidad
+                        pendiente.stock_minimo = stock_min
+                        pendiente.marca = marca
+                        pendiente.ubicacion = ubicacion
+                        pendiente.descripcion = descripcion
+                        pendiente.categoria_id = categoria.id
+                        nuevos[nombre.lower()] = (index, pendiente, repetidas + 1)
                     else:
                         # Crear nuevo producto
                         new_product = Producto(
@@ -128,20 +175,75 @@ class ExcelImporter:
                             ubicacion=ubicacion,
                             activo=True
                         )
-                        created = self.product_repo.create(new_product)
-                        existing_products[nombre.lower()] = created
-                        stats['created'] += 1
-                        logger.info(f"Producto creado: {nombre}")
-
-                    stats['success'] += 1
+                        nuevos[nombre.lower()] = (index, new_product, 0)
 
                 except Exception as e:
                     error_msg = f"Fila {index + 2}: {str(e)}"
                     logger.error(error_msg)
                     stats['errors'].append(error_msg)
 
+                if len(nuevos) + len(existentes) >= self.BATCH_SIZE:
+                    self._guardar_lote(nuevos, existentes, existing_products, stats)
+                    if progress_callback:
+                        progress_callback(index + 1, stats['total'])
+
+            self._guardar_lote(nuevos, existentes, existing_products, stats)
+            if progress_callback and not stats['cancelled']:
+                progress_callback(stats['total'], stats['total'])
+
             return stats
 
         except Exception as e:
             logger.error(f"Error general en importación: {e}")
             raise e
+
+    def _guardar_lote(self, nuevos, existentes, existing_products, stats):
+        """
+        Guarda el lote pendiente en una sola transacción y lo vacía.
+        Si la transacción falla (no se confirmó nada), se reintenta fila
+        por fila para reportar exactamente qué filas tienen errores. Las
+        filas repetidas de un producto se cuentan como actualizadas solo
+        si ese producto quedó guardado.
+        """
+        if not nuevos and not existentes:
+            return
+
+        try:
+            creados = self.product_repo.bulk_upsert(
+                [p for _, p, _ in nuevos.values()],
+                [p for _, p, _ in existentes.values()]
+            )
+        except Exception as e:
+            logger.warning(f"Lote rechazado ({e}); se reintenta fila por fila")
+            for index, producto, repetidas in existentes.values():
+                try:
+                    self.product_repo.update(producto)
+                    stats['updated'] += 1 + repetidas
+                    stats['success'] += 1 + repetidas
+                except Exception as e:
+                    error_msg = f"Fila {index + 2}: {str(e)}"
+                    logger.error(error_msg)
+                    stats['errors'].append(error_msg)
+            for index, producto, repetidas in nuevos.values():
+                try:
+                    created = self.product_repo.create(producto)
+                    existing_products[created.nombre.lower()] = created
+                    stats['created'] += 1
+                    stats['updated'] += repetidas
+                    stats['success'] += 1 + repetidas
+                except Exception as e:
+                    error_msg = f"Fila {index + 2}: {str(e)}"
+                    logger.error(error_msg)
+                    stats['errors'].append(error_msg)
+        else:
+            # creados sigue el orden de nuevos (claves = nombre en minúsculas)
+            for clave, producto in zip(nuevos, creados):
+                existing_products[clave] = producto
+            repetidas = sum(r for _, _, r in nuevos.values())
+            repetidas += sum(r for _, _, r in existentes.values())
+            stats['created'] += len(nuevos)
+            stats['updated'] += len(existentes) + repetidas
+            stats['success'] += len(nuevos) + len(existentes) + repetidas
+
+        nuevos.clear()
+        existentes.clear()